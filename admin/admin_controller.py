@@ -5,6 +5,7 @@ Web 管理控制台后端控制器
 """
 
 import os
+import json
 import time
 import psutil
 import hashlib
@@ -201,7 +202,7 @@ class AdminController:
                 },
                 'dictionary': {
                     'enabled': config_manager.dictionary.enabled,
-                    'rules_count': len(self.dictionary_service.get_all_rules())
+                    'rules_count': self.dictionary_service.get_stats()['total_rules']
                 }
             }
             
@@ -285,7 +286,7 @@ class AdminController:
             if rule_type:
                 rules = self.dictionary_service.get_rules_by_type(rule_type)
             else:
-                rules = self.dictionary_service.get_all_rules()
+                rules = self.dictionary_service.iter_rules()
             
             rules_data = [rule.to_dict() for rule in rules]
             
@@ -420,8 +421,13 @@ class AdminController:
             enabled_only = request.args.get('enabled_only', 'false').lower() == 'true'
             format_type = request.args.get('format', 'json')  # json 或 csv
             
-            # 导出规则
-            rules_data = self.dictionary_service.export_rules(rule_type, enabled_only)
+            # 先在锁内取规则快照，之后的过滤和序列化不受并发修改影响，
+            # 开始流式输出后也不会再因读取规则而出错
+            rules_data = [
+                rule for rule in self.dictionary_service.snapshot()['rules']
+                if (not rule_type or rule['type'] == rule_type)
+                and (not enabled_only or rule['enabled'])
+            ]
             
             if format_type == 'csv':
                 # CSV 格式导出
@@ -447,36 +453,43 @@ class AdminController:
                     }
                 )
             else:
-                # JSON 格式导出
-                export_data = {
+                # JSON 格式导出，规则逐条序列化后流式输出，统计信息在末尾输出
+                header = {
                     'version': '2.0',
                     'exported_at': datetime.now().isoformat(),
                     'filters': {
                         'type': rule_type,
                         'enabled_only': enabled_only
-                    },
-                    'rules': rules_data,
-                    'metadata': {
-                        'total_rules': len(rules_data),
-                        'type_counts': {}
                     }
                 }
                 
-                # 统计类型
+                type_counts = {}
                 for rule in rules_data:
-                    rule_type_key = rule['type']
-                    export_data['metadata']['type_counts'][rule_type_key] = export_data['metadata']['type_counts'].get(rule_type_key, 0) + 1
+                    type_counts[rule['type']] = type_counts.get(rule['type'], 0) + 1
+                metadata = {
+                    'total_rules': len(rules_data),
+                    'type_counts': type_counts
+                }
                 
-                # 记录审计日志
+                # 记录审计日志，不依赖客户端是否读完响应
                 self.logger.audit('dictionary_rules_export', session.get('user_id', 'unknown'),
                                 total_rules=len(rules_data),
                                 format=format_type,
                                 filters={'type': rule_type, 'enabled_only': enabled_only})
                 
-                return jsonify({
-                    'success': True,
-                    'data': export_data
-                })
+                def generate_export():
+                    """生成导出内容"""
+                    # 去掉头部对象的右括号，在其后接上 rules 和 metadata
+                    yield '{"success": true, "data": ' + json.dumps(header, ensure_ascii=False)[:-1] + ', "rules": ['
+                    
+                    separator = ''
+                    for rule in rules_data:
+                        yield separator + json.dumps(rule, ensure_ascii=False)
+                        separator = ', '
+                    
+                    yield '], "metadata": ' + json.dumps(metadata, ensure_ascii=False) + '}}'
+                
+                return Response(generate_export(), mimetype='application/json')
             
         except Exception as e:
             return self.error_handler.handle_error(e)
@@ -501,7 +514,7 @@ class AdminController:
             status_data['management_info'] = {
                 'admin_session_active': True,
                 'last_config_update': getattr(config_manager, '_last_update', None),
-                'dictionary_rules_count': len(self.dictionary_service.get_all_rules()),
+                'dictionary_rules_count': self.dictionary_service.get_stats()['total_rules'],
                 'system_start_time': self.start_time.isoformat()
             }
             
@@ -540,7 +553,7 @@ class AdminController:
                 },
                 'dictionary': {
                     'enabled': config_manager.dictionary.enabled,
-                    'rules_count': len(self.dictionary_service.get_all_rules()),
+                    'rules_count': self.dictionary_service.get_stats()['total_rules'],
                     'rules_file': config_manager.dictionary.rules_file
                 },
                 'system': {
@@ -566,7 +579,7 @@ class AdminController:
                 'current_user': session.get('user_id', 'unknown'),
                 'session_timeout': config_manager.admin.session_timeout,
                 'last_config_update': getattr(config_manager, '_last_update', None),
-                'dictionary_rules_count': len(self.dictionary_service.get_all_rules()),
+                'dictionary_rules_count': self.dictionary_service.get_stats()['total_rules'],
                 'system_start_time': self.start_time.isoformat(),
                 'login_time': session.get('login_time')
             }
@@ -5,7 +5,7 @@
 """
 
 from flask import Flask, request, jsonify
-import uuid
+import secrets
 import time
 from typing import Dict, Any
 
@@ -42,7 +42,7 @@ def create_enhanced_app() -> Flask:
     @app.before_request
     def before_request():
         """请求前处理 - 设置请求ID和开始时间"""
-        request.id = str(uuid.uuid4())[:8]
+        request.id = secrets.token_hex(4)
         request.start_time = time.time()
         logger.set_request_id(request.id)
         
@@ -146,14 +146,9 @@ def create_enhanced_app() -> Flask:
                     "cache_stats": enhanced_tts_service.audio_cache.get_stats()
                 }), 404
             
-            import io
-            output_io = io.BytesIO()
-            combined_audio.export(output_io, format="webm")
-            output_io.seek(0)
-            
             from flask import Response
             return Response(
-                output_io.getvalue(),
+                enhanced_tts_service.encode_webm(combined_audio),
                 mimetype='audio/webm',
                 headers={
                     'X-Cache-Hit': 'true',
@@ -881,6 +876,7 @@ if __name__ == '__main__':
         debug=config_manager.system.debug
     )
     
+    enhanced_tts_service.start_warm_up()
     app.run(
         host=config_manager.system.host,
         port=config_manager.system.port,
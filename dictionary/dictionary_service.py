@@ -7,15 +7,382 @@
 import json
 import re
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, NamedTuple, Optional, Any, Iterable, Iterator, Pattern, Sequence, Tuple, FrozenSet
+from dataclasses import dataclass
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 import os
+import sys
+import mmap
+import queue
+import threading
+import atexit
+import weakref
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse
+
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        """序列化为单行 UTF-8 字节"""
+        return orjson.dumps(data)
+
+    _loads = orjson.loads
+except ImportError:
+    # orjson 未安装时回退到标准库
+    orjson = None
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        """序列化为单行 UTF-8 字节"""
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
+
+try:
+    import re2
+except ImportError:
+    # google-re2 为可选依赖，未安装时使用标准库 re
+    re2 = None
+
+# 设置 DICTIONARY_REGEX_ENGINE=re2 且已安装 google-re2 时使用 RE2 引擎
+_USE_RE2 = re2 is not None and os.getenv('DICTIONARY_REGEX_ENGINE', 're').lower() == 're2'
+
+
+def _compile(pattern: str) -> Pattern:
+    """
+    编译规则正则
+    
+    启用 RE2 时优先使用线性时间的 RE2 引擎，避免管理员录入的规则发生
+    灾难性回溯；RE2 不支持的语法（反向引用、环视等）自动回退到 re。
+    注意 RE2 的 \\b 只把 ASCII 字符视为单词字符，紧挨中文时的匹配结果与 re 不同。
+    
+    Args:
+        pattern: 正则表达式
+        
+    Returns:
+        编译后的正则对象
+    """
+    if _USE_RE2:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+
+# process_text 结果缓存的容量，以及参与缓存的最大文本长度
+_PROCESS_CACHE_SIZE = 4096
+_PROCESS_CACHE_MAX_TEXT = 2048
+
+# 默认规则模板（不含时间戳），创建默认规则文件时使用
+_DEFAULT_RULES_TEMPLATE = (
+    {'id': '1', 'type': 'pronunciation', 'pattern': r'\bGitHub\b', 'replacement': '吉特哈布', 'enabled': True},
+    {'id': '2', 'type': 'pronunciation', 'pattern': r'\bAPI\b', 'replacement': 'A P I', 'enabled': True},
+    {'id': '3', 'type': 'pronunciation', 'pattern': r'\bJSON\b', 'replacement': 'J S O N', 'enabled': True},
+    {'id': '4', 'type': 'filter', 'pattern': r'敏感词汇', 'replacement': '***', 'enabled': True},
+)
+
+
+def _load_json_file(path: str) -> Any:
+    """
+    读取并解析 JSON 文件
+    
+    使用 orjson 时通过 mmap 直接解析文件映射，省去读入 bytes 的额外拷贝。
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return _loads(f.read())
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _required_chars(pattern: str) -> FrozenSet[str]:
+    """
+    提取正则匹配成功时文本中必然包含的字面字符
+    
+    只收集顶层（含必选分组和至少重复一次的部分）的字面字符，分支、
+    可选部分和断言都跳过；忽略大小写或无法解析时返回空集，表示不做预筛选。
+    
+    Args:
+        pattern: 正则表达式模式
+        
+    Returns:
+        必需字符集合
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return frozenset()
+    
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    if state.flags & re.IGNORECASE:
+        return frozenset()
+    
+    chars = set()
+    if not _collect_required_chars(parsed, chars):
+        return frozenset()
+    return frozenset(chars)
+
+
+def _collect_required_chars(items, chars: set) -> bool:
+    """递归收集必需字面字符，遇到局部忽略大小写时返回 False"""
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            chars.add(chr(av))
+        elif op is _sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = av
+            if add_flags & re.IGNORECASE:
+                return False
+            if not _collect_required_chars(sub, chars):
+                return False
+        elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT):
+            min_count, _, sub = av
+            if min_count >= 1 and not _collect_required_chars(sub, chars):
+                return False
+    return True
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    提取正则匹配成功时文本中必然包含的最长连续字面串
+    
+    只在顶层（含必选分组）的连续字面字符中查找，零宽断言（如 \\b）不打断
+    连续性；忽略大小写或无法解析时返回空串，表示不做预筛选。
+    
+    Args:
+        pattern: 正则表达式模式
+        
+    Returns:
+        必需的字面串
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return ''
+    
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    if state.flags & re.IGNORECASE:
+        return ''
+    
+    runs = ['']
+    if not _collect_literal_runs(parsed, runs):
+        return ''
+    return max(runs, key=len)
+
+
+def _collect_literal_runs(items, runs: List[str]) -> bool:
+    """递归收集连续字面串，runs 的最后一项为当前正在延长的串"""
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            runs[-1] += chr(av)
+        elif op is _sre_parse.AT:
+            continue
+        elif op is _sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = av
+            if add_flags & re.IGNORECASE:
+                return False
+            if not _collect_literal_runs(sub, runs):
+                return False
+        else:
+            runs.append('')
+    return True
+
+
+def _literal_form(pattern: str) -> Optional[Tuple[str, bool]]:
+    """
+    把只由字面字符组成（两端可带 \\b）的规则解析为字面串
+    
+    Args:
+        pattern: 正则表达式模式
+        
+    Returns:
+        (字面串, 是否带 \\b) 元组，含其他正则语法或无法解析时返回 None
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return None
+    
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    if state.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    
+    items = list(parsed)
+    boundary = False
+    for edge in (0, -1):
+        if items and items[edge] == (_sre_parse.AT, _sre_parse.AT_BOUNDARY):
+            items.pop(edge)
+            boundary = True
+    if not items or any(op is not _sre_parse.LITERAL for op, _ in items):
+        return None
+    return ''.join(chr(av) for _, av in items), boundary
+
+
+def _strings_overlap(a: str, b: str) -> bool:
+    """两个字符串在某种对齐方式下是否有重叠部分（包含或首尾相接重合）"""
+    if a in b or b in a:
+        return True
+    for k in range(1, min(len(a), len(b))):
+        if a.endswith(b[:k]) or b.endswith(a[:k]):
+            return True
+    return False
+
+
+_WORD_CHAR = re.compile(r'\w')
+_ASCII_WORD_CHAR = re.compile(r'\w', re.ASCII)
+
+
+def _word_kind(ch: str) -> Tuple[bool, bool]:
+    """字符对 \\b 的影响，同时考虑 re 的 Unicode 语义和 RE2 的 ASCII 语义"""
+    return bool(_WORD_CHAR.match(ch)), bool(_ASCII_WORD_CHAR.match(ch))
+
+
+def _rules_independent(rules: Sequence['DictionaryRule']) -> bool:
+    """
+    判断一组规则一次扫描替换的结果是否与逐条依次替换完全相同
+    
+    只接受字面规则（两端可带 \\b），且任意两条规则的匹配不会重叠、
+    靠前规则的替换结果不会产生或破坏靠后规则的匹配。无法确认时返回 False。
+    
+    Args:
+        rules: 按优先级排列的规则列表
+        
+    Returns:
+        是否可以合并为一次扫描
+    """
+    forms = []
+    for rule in rules:
+        form = _literal_form(rule.pattern)
+        if form is None:
+            return False
+        forms.append((form[0], form[1], rule.replacement, frozenset(form[0])))
+    
+    for index, (literal, _, replacement, literal_chars) in enumerate(forms):
+        replacement_chars = frozenset(replacement)
+        # 替换为空串会让两侧文本拼接出新的匹配
+        if not replacement and index + 1 < len(forms):
+            return False
+        edges_kept = bool(replacement) and (
+            _word_kind(replacement[0]) == _word_kind(literal[0])
+            and _word_kind(replacement[-1]) == _word_kind(literal[-1])
+        )
+        for later, boundary, _, later_chars in forms[index + 1:]:
+            if literal_chars & later_chars and _strings_overlap(literal, later):
+                return False
+            if replacement_chars & later_chars and _strings_overlap(replacement, later):
+                return False
+            # 替换改变了边界两侧字符的类别，靠后规则的 \b 判断可能随之改变
+            if boundary and not edges_kept:
+                return False
+    return True
+
+
+def _bump_count(counts: Dict[str, int], key: str, delta: int) -> None:
+    """增减计数，计数归零时删除该键"""
+    count = counts.get(key, 0) + delta
+    if count > 0:
+        counts[key] = count
+    else:
+        counts.pop(key, None)
+
+
+# 启动过后台写入线程的服务实例，只持有弱引用，进程退出时统一写完待保存的规则
+_WRITER_SERVICES: 'weakref.WeakSet[DictionaryService]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_services() -> None:
+    """进程退出前写完所有存活服务实例的最后一次保存"""
+    for service in list(_WRITER_SERVICES):
+        service.flush()
+
+
+def _wake_writer(save_queue: queue.Queue) -> None:
+    """唤醒等待中的写入线程；队列已满说明线程很快会被唤醒"""
+    try:
+        save_queue.put_nowait(None)
+    except queue.Full:
+        pass
+
+
+def _writer_loop(service_ref: 'weakref.ref[DictionaryService]', save_queue: queue.Queue) -> None:
+    """
+    后台写入线程主循环
+    
+    写入使用调用方保存时取好的快照，线程从不获取规则锁，调用方持有
+    规则锁时等待写入也不会死锁。线程只持有服务的弱引用，不会阻止服务被回收；服务回收后由终结器
+    唤醒线程，线程随即退出。
+    
+    Args:
+        service_ref: 服务实例的弱引用
+        save_queue: 保存请求队列
+    """
+    while True:
+        save_queue.get()
+        try:
+            service = service_ref()
+            if service is None:
+                return
+            try:
+                service._write_pending()
+            except Exception:
+                # 错误已在 _write_rules_file 中记录
+                pass
+            # 等待下一次请求前释放强引用
+            service = None
+        finally:
+            save_queue.task_done()
+
+
+# 无法提取预筛选条件时使用的默认值：空字面串总是包含在文本中
+_NO_PREFILTER: Tuple[str, FrozenSet[str]] = ('', frozenset())
+
+
+class _ActiveRule(NamedTuple):
+    """启用规则在构建匹配器时的只读副本，规则对象之后被原地修改也不受影响"""
+    id: str
+    pattern: str
+    replacement: str
+
+
+class _CompiledRules:
+    """
+    某一规则版本下的启用规则和匹配器
+    
+    构建后不再修改，处理文本时整体取用一份，不会混用新旧两个版本的匹配器；
+    处理结果缓存按对象身份区分版本。
+    """
+    
+    __slots__ = ('version', 'by_type', 'active_pron', 'active_filter', 'active_rules',
+                 'combined_matcher', 'pron_matcher', 'filter_matcher', 'prefilters', 'compiled')
+    
+    def __init__(self, version: int):
+        self.version = version
+        self.by_type: Dict[str, List['DictionaryRule']] = {}
+        self.active_pron: List[_ActiveRule] = []
+        self.active_filter: List[_ActiveRule] = []
+        self.active_rules: List[_ActiveRule] = []
+        self.combined_matcher: Optional[Tuple[Pattern, Dict[int, str]]] = None
+        self.pron_matcher: Optional[Tuple[Pattern, Dict[int, str]]] = None
+        self.filter_matcher: Optional[Tuple[Pattern, Dict[int, str]]] = None
+        self.prefilters: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+        self.compiled: Dict[str, Pattern] = {}
 
 
 @dataclass
 class DictionaryRule:
     """字典规则数据模型"""
+    # 手写 __slots__（而非 slots=True）以兼容 Python 3.8
+    __slots__ = ('id', 'type', 'pattern', 'replacement', 'enabled', 'created_at', 'updated_at')
+    
     id: str
     type: str  # 'pronunciation' | 'filter'
     pattern: str
@@ -24,9 +391,24 @@ class DictionaryRule:
     created_at: str
     updated_at: str
     
+    def __post_init__(self):
+        # 大量规则共享相同的类型和替换内容，驻留字符串避免重复的小对象
+        for name in ('type', 'pattern', 'replacement'):
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'type': self.type,
+            'pattern': self.pattern,
+            'replacement': self.replacement,
+            'enabled': self.enabled,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DictionaryRule':
@@ -51,8 +433,33 @@ class DictionaryService:
         """
         self.rules_file = rules_file
         self.rules: List[DictionaryRule] = []
+        self._by_id: Dict[str, DictionaryRule] = {}
+        self._next_id = 1
+        
+        # 按类型统计的规则数和启用规则数，随规则变更增量维护
+        self._type_counts: Dict[str, int] = {}
+        self._enabled_counts: Dict[str, int] = {}
         self.logger = logging.getLogger(__name__)
         
+        # 启用规则的编译缓存，规则变更时版本递增，版本不一致时在下次处理文本时惰性重建
+        self._rules_version = 0
+        self._compiled_rules: Optional[_CompiledRules] = None
+        
+        # 处理结果缓存，以 (文本, 编译缓存) 为键，规则变更时清空
+        self._process_cached = lru_cache(maxsize=_PROCESS_CACHE_SIZE)(self._process_uncached)
+        
+        # 批量操作期间延迟保存
+        self._in_batch = False
+        self._batch_pending = False
+        
+        # 后台写入线程：容量为 1 的队列用于合并连续的保存请求，
+        # 待写入的快照由保存方生成，写入线程只取最新的一份
+        self._lock = threading.RLock()
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._writer: Optional[threading.Thread] = None
+        self._pending_lock = threading.Lock()
+        self._pending_snapshot: Optional[Dict[str, Any]] = None
+        
         # 确保规则文件目录存在
         os.makedirs(os.path.dirname(rules_file), exist_ok=True)
         
@@ -69,34 +476,252 @@ class DictionaryService:
         Returns:
             处理后的文本
         """
-        if not text:
+        compiled = self._current_rules()
+        
+        # 空文本或没有启用的规则时直接返回
+        if not text or not compiled.active_rules:
             return text
+        
+        # 重复出现的短文本直接命中缓存，过长的文本不缓存以控制内存
+        if len(text) > _PROCESS_CACHE_MAX_TEXT:
+            return self._process_uncached(text, compiled)
+        return self._process_cached(text, compiled)
+    
+    def process_batch(self, texts: List[str]) -> List[str]:
+        """
+        批量处理文本
+        
+        规则缓存检查和方法查找只做一次，整批文本使用同一版本的规则，
+        适合文本分段后逐段处理的场景。
+        
+        Args:
+            texts: 待处理的文本列表
             
-        processed_text = text
+        Returns:
+            处理后的文本列表，顺序与输入一致
+        """
+        compiled = self._current_rules()
+        
+        if not compiled.active_rules:
+            return list(texts)
         
-        # 按类型分组处理规则
-        pronunciation_rules = [r for r in self.rules if r.type == 'pronunciation' and r.enabled]
-        filter_rules = [r for r in self.rules if r.type == 'filter' and r.enabled]
+        process_cached = self._process_cached
+        process_uncached = self._process_uncached
         
-        # 先应用发音替换规则
-        for rule in pronunciation_rules:
+        results = []
+        for text in texts:
+            if not text:
+                results.append(text)
+            elif len(text) > _PROCESS_CACHE_MAX_TEXT:
+                results.append(process_uncached(text, compiled))
+            else:
+                results.append(process_cached(text, compiled))
+        return results
+    
+    def _process_uncached(self, text: str, compiled: _CompiledRules) -> str:
+        """
+        实际执行规则替换
+        
+        Args:
+            text: 待处理的文本
+            compiled: 本次处理使用的编译缓存，同时作为结果缓存键的一部分
+            
+        Returns:
+            处理后的文本
+        """
+        # 所有规则都可合并时一次扫描完成，同一位置发音规则优先于过滤规则
+        if compiled.combined_matcher:
+            return self._apply_pass(compiled, compiled.active_rules, compiled.combined_matcher, text, '字典')
+        
+        # 否则先应用发音替换规则，再应用内容过滤规则
+        processed_text = self._apply_pass(compiled, compiled.active_pron, compiled.pron_matcher, text, '发音')
+        processed_text = self._apply_pass(compiled, compiled.active_filter, compiled.filter_matcher, processed_text, '过滤')
+        
+        return processed_text
+    
+    def _apply_pass(self, compiled: _CompiledRules, rules: List[_ActiveRule], 
+                    matcher: Optional[Tuple[Pattern, Dict[int, str]]], 
+                    text: str, label: str) -> str:
+        """
+        应用一组规则
+        
+        先做预筛选：文本不包含规则必需的字面串，或缺少字面串以外的必需
+        字符时该规则不可能匹配，所有规则都被排除时直接跳过正则扫描。
+        字面串检查直接使用 str 的子串查找，只有需要时才构造字符集合。
+        
+        Args:
+            compiled: 编译缓存，提供预筛选条件和预编译正则
+            rules: 启用的规则列表
+            matcher: 合并后的匹配器，无法合并时为 None
+            text: 待处理的文本
+            label: 规则类型名称，用于日志
+            
+        Returns:
+            处理后的文本
+        """
+        if not rules:
+            return text
+        
+        prefilters = compiled.prefilters
+        chars = None
+        
+        if matcher:
+            for rule in rules:
+                literal, extra_chars = prefilters.get(rule.pattern, _NO_PREFILTER)
+                if literal not in text:
+                    continue
+                if extra_chars:
+                    if chars is None:
+                        chars = set(text)
+                    if not extra_chars <= chars:
+                        continue
+                return self._apply_fused(matcher, text)
+            return text
+        
+        patterns = compiled.compiled
+        for rule in rules:
+            literal, extra_chars = prefilters.get(rule.pattern, _NO_PREFILTER)
+            if literal not in text:
+                continue
+            if extra_chars:
+                if chars is None:
+                    chars = set(text)
+                if not extra_chars <= chars:
+                    continue
+            pattern = patterns.get(rule.pattern)
+            if pattern is None:
+                self.logger.error(f"{label}规则 {rule.id} 正则表达式无效: {rule.pattern}")
+                continue
             try:
-                processed_text = re.sub(rule.pattern, rule.replacement, processed_text)
-                self.logger.debug(f"应用发音规则 {rule.id}: {rule.pattern} -> {rule.replacement}")
+                text, count = pattern.subn(rule.replacement, text)
             except re.error as e:
-                self.logger.error(f"发音规则 {rule.id} 正则表达式错误: {e}")
+                self.logger.error(f"{label}规则 {rule.id} 正则表达式错误: {e}")
                 continue
+            
+            if count:
+                # 替换可能引入新字符，预筛选用的字符集需要重新构造
+                chars = None
+                # 使用 % 参数延迟格式化，未开启调试日志时不产生字符串开销
+                self.logger.debug("应用%s规则 %s: %s -> %s", label, rule.id, rule.pattern, rule.replacement)
         
-        # 再应用内容过滤规则
-        for rule in filter_rules:
-            try:
-                processed_text = re.sub(rule.pattern, rule.replacement, processed_text)
-                self.logger.debug(f"应用过滤规则 {rule.id}: {rule.pattern} -> {rule.replacement}")
-            except re.error as e:
-                self.logger.error(f"过滤规则 {rule.id} 正则表达式错误: {e}")
+        return text
+    
+    def _apply_fused(self, matcher: Tuple[Pattern, Dict[int, str]], text: str) -> str:
+        """
+        使用合并后的正则一次扫描文本，按命中的分支分派替换内容
+        
+        Args:
+            matcher: (合并正则, 分组序号 -> 替换内容) 元组
+            text: 待处理的文本
+            
+        Returns:
+            替换后的文本
+        """
+        combined, replacements = matcher
+        # 合并正则中的规则均不含分组，lastindex 即命中规则对应的分组序号
+        return combined.sub(lambda match: replacements[match.lastindex], text)
+    
+    def _invalidate_cache(self) -> None:
+        """规则版本递增，下次处理文本时重建编译缓存"""
+        with self._lock:
+            self._rules_version += 1
+            self._process_cached.cache_clear()
+    
+    def _current_rules(self) -> _CompiledRules:
+        """
+        获取与当前规则版本一致的编译缓存，版本落后时在锁内重建
+        
+        Returns:
+            编译缓存，调用方在整个处理过程中只使用这一份
+        """
+        compiled = self._compiled_rules
+        if compiled is None or compiled.version != self._rules_version:
+            with self._lock:
+                compiled = self._compiled_rules
+                if compiled is None or compiled.version != self._rules_version:
+                    compiled = self._build_compiled_rules()
+                    self._compiled_rules = compiled
+        return compiled
+    
+    def _build_compiled_rules(self) -> _CompiledRules:
+        """按类型重建规则列表、启用规则列表和合并正则，调用方需持有 _lock"""
+        result = _CompiledRules(self._rules_version)
+        by_type: Dict[str, List[DictionaryRule]] = {}
+        for rule in self.rules:
+            by_type.setdefault(rule.type, []).append(rule)
+        result.by_type = by_type
+        result.active_pron = [
+            _ActiveRule(r.id, r.pattern, r.replacement)
+            for r in by_type.get('pronunciation', ()) if r.enabled
+        ]
+        result.active_filter = [
+            _ActiveRule(r.id, r.pattern, r.replacement)
+            for r in by_type.get('filter', ()) if r.enabled
+        ]
+        result.active_rules = result.active_pron + result.active_filter
+        result.combined_matcher = self._build_fused_matcher(result.active_rules)
+        if not result.combined_matcher:
+            result.pron_matcher = self._build_fused_matcher(result.active_pron)
+            result.filter_matcher = self._build_fused_matcher(result.active_filter)
+        # 预筛选条件：必需字面串，以及字面串之外仍需检查的必需字符
+        prefilters = {}
+        for rule in result.active_rules:
+            if rule.pattern not in prefilters:
+                literal = _required_literal(rule.pattern)
+                prefilters[rule.pattern] = (literal, _required_chars(rule.pattern) - frozenset(literal))
+        result.prefilters = prefilters
+        
+        # 逐条处理时使用的预编译正则，按模式字符串去重并沿用上次重建时已编译的对象，
+        # 无效的正则不放入缓存；全部规则已合并时无需编译
+        previous = self._compiled_rules.compiled if self._compiled_rules else {}
+        compiled = {}
+        for rule in ([] if result.combined_matcher else result.active_rules):
+            if rule.pattern in compiled:
                 continue
+            pattern = previous.get(rule.pattern)
+            if pattern is None:
+                try:
+                    pattern = _compile(rule.pattern)
+                except re.error:
+                    continue
+            compiled[rule.pattern] = pattern
+        result.compiled = compiled
+        return result
+    
+    def _build_fused_matcher(self, rules: List[_ActiveRule]) -> Optional[Tuple[Pattern, Dict[int, str]]]:
+        """
+        将规则合并为一个按规则顺序排列的分支正则
         
-        return processed_text
+        一次扫描与逐条依次替换只在规则互不影响时等价：规则匹配可能重叠，
+        或前一条规则的替换结果会被后一条规则继续匹配（链式规则）时，
+        返回 None 由调用方逐条处理。规则中含有分组或替换内容含有转义/
+        分组引用时同样不合并。
+        
+        Args:
+            rules: 按优先级排列的启用规则列表
+            
+        Returns:
+            (合并正则, 分组序号 -> 替换内容) 元组，无法合并时返回 None
+        """
+        if not rules or not _rules_independent(rules):
+            return None
+        
+        branches = []
+        replacements = {}
+        for index, rule in enumerate(rules, 1):
+            try:
+                if re.compile(rule.pattern).groups or '\\' in rule.replacement:
+                    return None
+            except re.error:
+                return None
+            branches.append(f"({rule.pattern})")
+            replacements[index] = rule.replacement
+        
+        try:
+            return _compile('|'.join(branches)), replacements
+        except re.error as e:
+            self.logger.debug(f"规则无法合并为单个正则，逐条处理: {e}")
+            return None
     
     def add_rule(self, pattern: str, replacement: str, rule_type: str, rule_id: Optional[str] = None) -> str:
         """
@@ -127,7 +752,7 @@ class DictionaryService:
             rule_id = self._generate_simple_id(rule_type)
         
         # 检查ID是否已存在
-        if any(rule.id == rule_id for rule in self.rules):
+        if rule_id in self._by_id:
             raise ValueError(f"规则ID已存在: {rule_id}")
         
         # 创建新规则
@@ -143,7 +768,11 @@ class DictionaryService:
         )
         
         # 添加到规则列表
-        self.rules.append(new_rule)
+        with self._lock:
+            self.rules.append(new_rule)
+            self._by_id[rule_id] = new_rule
+            self._count_rule(new_rule, 1)
+        self._invalidate_cache()
         
         # 保存到文件
         self._save_rules()
@@ -161,10 +790,15 @@ class DictionaryService:
         Returns:
             是否成功删除
         """
-        original_count = len(self.rules)
-        self.rules = [rule for rule in self.rules if rule.id != rule_id]
+        with self._lock:
+            removed_rule = self._by_id.pop(rule_id, None)
+            removed = removed_rule is not None
+            if removed:
+                self.rules = [rule for rule in self.rules if rule.id != rule_id]
+                self._count_rule(removed_rule, -1)
         
-        if len(self.rules) < original_count:
+        if removed:
+            self._invalidate_cache()
             self._save_rules()
             self.logger.info(f"删除规则: {rule_id}")
             return True
@@ -195,11 +829,19 @@ class DictionaryService:
             raise ValueError(f"无效的规则类型: {kwargs['type']}")
         
         # 更新规则
-        for key, value in kwargs.items():
-            if hasattr(rule, key):
-                setattr(rule, key, value)
-        
-        rule.updated_at = datetime.now().isoformat()
+        with self._lock:
+            self._count_rule(rule, -1)
+            for key, value in kwargs.items():
+                if key in DictionaryRule.__slots__:
+                    setattr(rule, key, value)
+            self._count_rule(rule, 1)
+            
+            if rule.id != rule_id:
+                self._by_id.pop(rule_id, None)
+                self._by_id[rule.id] = rule
+            
+            rule.updated_at = datetime.now().isoformat()
+        self._invalidate_cache()
         
         # 保存到文件
         self._save_rules()
@@ -217,10 +859,7 @@ class DictionaryService:
         Returns:
             规则对象，如果不存在则返回None
         """
-        for rule in self.rules:
-            if rule.id == rule_id:
-                return rule
-        return None
+        return self._by_id.get(rule_id)
     
     def get_all_rules(self) -> List[DictionaryRule]:
         """
@@ -229,7 +868,16 @@ class DictionaryService:
         Returns:
             规则列表
         """
-        return self.rules.copy()
+        return list(self.rules)
+    
+    def iter_rules(self) -> Iterator[DictionaryRule]:
+        """
+        遍历所有规则，只需读取时使用以避免复制列表
+        
+        Returns:
+            规则迭代器
+        """
+        return iter(self.rules)
     
     def get_rules_by_type(self, rule_type: str) -> List[DictionaryRule]:
         """
@@ -241,7 +889,60 @@ class DictionaryService:
         Returns:
             指定类型的规则列表
         """
-        return [rule for rule in self.rules if rule.type == rule_type]
+        return list(self._current_rules().by_type.get(rule_type, ()))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取与规则文件结构相同的内存快照，读取配置时无需等待写入或重新解析文件
+        
+        Returns:
+            包含 version、rules、metadata 的字典，修改它不会影响服务中的规则
+        """
+        with self._lock:
+            stats = self.get_stats()
+            return {
+                'version': '2.0',  # 版本标识
+                'rules': [rule.to_dict() for rule in self.rules],
+                'metadata': {
+                    'updated_at': datetime.now().isoformat(),
+                    'total_rules': stats['total_rules'],
+                    'enabled_rules': stats['enabled_rules'],
+                    'type_counts': stats['type_counts'],
+                    'next_id': self._next_id
+                }
+            }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取规则统计信息，直接返回增量维护的计数，无需遍历规则
+        
+        Returns:
+            包含总数、启用数及按类型统计的字典
+        """
+        with self._lock:
+            return {
+                'total_rules': len(self.rules),
+                'enabled_rules': sum(self._enabled_counts.values()),
+                'type_counts': dict(self._type_counts),
+                'enabled_counts': dict(self._enabled_counts)
+            }
+    
+    def _count_rule(self, rule: DictionaryRule, delta: int) -> None:
+        """
+        更新规则计数
+        
+        Args:
+            rule: 规则对象
+            delta: 1 表示加入规则，-1 表示移除规则
+        """
+        _bump_count(self._type_counts, rule.type, delta)
+        if rule.enabled:
+            _bump_count(self._enabled_counts, rule.type, delta)
+    
+    def _recount_rules(self) -> None:
+        """整体加载规则后重新统计计数"""
+        self._type_counts = dict(Counter(rule.type for rule in self.rules))
+        self._enabled_counts = dict(Counter(rule.type for rule in self.rules if rule.enabled))
     
     def enable_rule(self, rule_id: str) -> bool:
         """启用规则"""
@@ -255,16 +956,19 @@ class DictionaryService:
         """
         重新加载规则文件 - 兼容新旧格式
         """
+        # 先写完待处理的保存，避免读到旧文件
+        self.flush()
+        
         try:
             if os.path.exists(self.rules_file):
-                with open(self.rules_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json_file(self.rules_file)
                 
-                self.rules = []
+                rules = []
                 
                 # 检查文件版本
                 version = data.get('version', '1.0')
                 rules_data = data.get('rules', [])
+                metadata = {}
                 
                 if version == '2.0':
                     # 新格式
@@ -278,10 +982,22 @@ class DictionaryService:
                 for rule_data in rules_data:
                     try:
                         rule = DictionaryRule.from_dict(rule_data)
-                        self.rules.append(rule)
+                        rules.append(rule)
                     except Exception as e:
                         self.logger.error(f"加载规则失败: {rule_data}, 错误: {e}")
                 
+                with self._lock:
+                    self.rules = rules
+                    self._by_id = {rule.id: rule for rule in rules}
+                    # 优先使用文件中记录的下一个ID，已删除规则的ID不会被重新分配；
+                    # 文件被手动编辑导致记录偏小时以现有规则为准
+                    try:
+                        stored_next_id = int(metadata.get('next_id', 0))
+                    except (TypeError, ValueError):
+                        stored_next_id = 0
+                    self._next_id = max(stored_next_id, self._scan_next_id())
+                    self._recount_rules()
+                self._invalidate_cache()
                 self.logger.info(f"成功加载 {len(self.rules)} 条规则")
                 
                 # 如果是旧格式，自动升级
@@ -296,7 +1012,12 @@ class DictionaryService:
                 
         except Exception as e:
             self.logger.error(f"加载规则文件失败: {e}")
-            self.rules = []
+            with self._lock:
+                self.rules = []
+                self._by_id = {}
+                self._next_id = 1
+                self._recount_rules()
+            self._invalidate_cache()
     
     def validate_rule(self, pattern: str) -> bool:
         """
@@ -325,83 +1046,140 @@ class DictionaryService:
         Returns:
             导入结果统计
         """
-        results = {
-            'success_count': 0,
-            'error_count': 0,
-            'skipped_count': 0,
-            'errors': [],
-            'imported_ids': []
-        }
+        results = self._new_import_results()
         
-        for i, rule_data in enumerate(rules_data):
-            try:
-                # 验证必需字段
-                if not all(key in rule_data for key in ['pattern', 'replacement', 'type']):
+        # 同一批次的规则共用一个时间戳
+        now = datetime.now().isoformat()
+        
+        def numbered_rules():
+            for i, rule_data in enumerate(rules_data):
+                # 验证必需字段，非字典的条目同样按缺少字段处理
+                if not isinstance(rule_data, dict) or not all(
+                        key in rule_data for key in ['pattern', 'replacement', 'type']):
                     results['errors'].append(f"第 {i+1} 条规则缺少必需字段")
                     results['error_count'] += 1
                     continue
                 
-                # 验证规则类型
-                if rule_data['type'] not in ['pronunciation', 'filter']:
-                    results['errors'].append(f"第 {i+1} 条规则类型无效: {rule_data['type']}")
+                # 构造失败只记录这一条，不中断整个批次
+                try:
+                    rule = DictionaryRule(
+                        id=rule_data.get('id'),
+                        type=rule_data['type'],
+                        pattern=rule_data['pattern'],
+                        replacement=rule_data['replacement'],
+                        enabled=rule_data.get('enabled', True),
+                        created_at=now,
+                        updated_at=now
+                    )
+                except Exception as e:
+                    results['errors'].append(f"第 {i+1} 条规则导入失败: {str(e)}")
                     results['error_count'] += 1
                     continue
                 
-                # 验证正则表达式
-                if not self.validate_rule(rule_data['pattern']):
-                    results['errors'].append(f"第 {i+1} 条规则正则表达式无效: {rule_data['pattern']}")
-                    results['error_count'] += 1
-                    continue
-                
-                # 检查是否已存在相同的规则
-                existing_rule = None
-                for rule in self.rules:
-                    if rule.pattern == rule_data['pattern'] and rule.type == rule_data['type']:
-                        existing_rule = rule
-                        break
-                
-                if existing_rule and not overwrite:
-                    results['skipped_count'] += 1
-                    continue
-                
-                # 生成或使用指定的ID
-                rule_id = rule_data.get('id')
-                if not rule_id:
-                    rule_id = self._generate_simple_id(rule_data['type'])
-                
-                # 如果ID已存在且不允许覆盖，生成新ID
-                if any(rule.id == rule_id for rule in self.rules) and not overwrite:
-                    rule_id = self._generate_simple_id(rule_data['type'])
-                
-                # 删除已存在的规则（如果覆盖）
-                if existing_rule and overwrite:
-                    self.remove_rule(existing_rule.id)
-                
-                # 添加新规则
-                now = datetime.now().isoformat()
-                new_rule = DictionaryRule(
-                    id=rule_id,
-                    type=rule_data['type'],
-                    pattern=rule_data['pattern'],
-                    replacement=rule_data['replacement'],
-                    enabled=rule_data.get('enabled', True),
-                    created_at=now,
-                    updated_at=now
-                )
-                
-                self.rules.append(new_rule)
-                results['success_count'] += 1
-                results['imported_ids'].append(rule_id)
-                
-            except Exception as e:
-                results['errors'].append(f"第 {i+1} 条规则导入失败: {str(e)}")
-                results['error_count'] += 1
+                yield i, rule
         
-        # 保存到文件
-        if results['success_count'] > 0:
-            self._save_rules()
-            self.logger.info(f"批量导入完成: 成功 {results['success_count']}, 失败 {results['error_count']}, 跳过 {results['skipped_count']}")
+        return self._import_rule_objects(numbered_rules(), overwrite, results)
+    
+    def import_typed(self, rules: Sequence[DictionaryRule], overwrite: bool = False) -> Dict[str, Any]:
+        """
+        批量导入已构造好的规则对象，跳过字典到规则对象的转换
+        
+        规则对象会被直接放入规则列表（ID 为空或冲突时会被改写），调用方
+        导入后不应再修改它们。
+        
+        Args:
+            rules: 规则对象列表
+            overwrite: 是否覆盖已存在的规则
+            
+        Returns:
+            导入结果统计，格式与 import_rules 相同
+        """
+        return self._import_rule_objects(enumerate(rules), overwrite, self._new_import_results())
+    
+    @staticmethod
+    def _new_import_results() -> Dict[str, Any]:
+        """创建空的导入结果统计"""
+        return {
+            'success_count': 0,
+            'error_count': 0,
+            'skipped_count': 0,
+            'errors': [],
+            'imported_ids': []
+        }
+    
+    def _import_rule_objects(self, numbered_rules: Iterable[Tuple[int, DictionaryRule]], 
+                             overwrite: bool, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        校验并导入规则对象，整个批次只保存一次文件
         
+        Args:
+            numbered_rules: (序号, 规则对象) 序列，序号用于错误信息
+            overwrite: 是否覆盖已存在的规则
+            results: 导入结果统计，就地更新
+            
+        Returns:
+            导入结果统计
+        """
+        with self.bulk():
+            # (模式, 类型) -> 规则，整个批次只建一次，用于 O(1) 查重
+            existing_by_key: Dict[Tuple[str, str], DictionaryRule] = {}
+            for rule in self.rules:
+                existing_by_key.setdefault((rule.pattern, rule.type), rule)
+            
+            for i, new_rule in numbered_rules:
+                try:
+                    # 验证规则类型
+                    if new_rule.type not in ['pronunciation', 'filter']:
+                        results['errors'].append(f"第 {i+1} 条规则类型无效: {new_rule.type}")
+                        results['error_count'] += 1
+                        continue
+                    
+                    # 检查是否已存在相同的规则，已存在且不覆盖时无需编译正则
+                    key = (new_rule.pattern, new_rule.type)
+                    existing_rule = existing_by_key.get(key)
+                    
+                    if existing_rule and not overwrite:
+                        results['skipped_count'] += 1
+                        continue
+                    
+                    # 验证正则表达式
+                    if not self.validate_rule(new_rule.pattern):
+                        results['errors'].append(f"第 {i+1} 条规则正则表达式无效: {new_rule.pattern}")
+                        results['error_count'] += 1
+                        continue
+                    
+                    # 未指定ID时自动生成
+                    if not new_rule.id:
+                        new_rule.id = self._generate_simple_id(new_rule.type)
+                    
+                    # 如果ID已存在且不允许覆盖，生成新ID
+                    if new_rule.id in self._by_id and not overwrite:
+                        new_rule.id = self._generate_simple_id(new_rule.type)
+                    
+                    # 删除已存在的规则（如果覆盖），直接过滤以免每条规则都写一次文件
+                    if existing_rule and overwrite:
+                        self.rules = [rule for rule in self.rules if rule.id != existing_rule.id]
+                        self._by_id.pop(existing_rule.id, None)
+                        self._count_rule(existing_rule, -1)
+                    
+                    # 添加新规则
+                    self.rules.append(new_rule)
+                    self._by_id[new_rule.id] = new_rule
+                    existing_by_key[key] = new_rule
+                    self._count_rule(new_rule, 1)
+                    results['success_count'] += 1
+                    results['imported_ids'].append(new_rule.id)
+                
+                except Exception as e:
+                    results['errors'].append(f"第 {i+1} 条规则导入失败: {str(e)}")
+                    results['error_count'] += 1
+            
+            # 整个批次只使缓存失效一次，保存到文件（退出批量上下文时统一写入）
+            if results['success_count'] > 0:
+                self._invalidate_cache()
+                self._save_rules()
+                self.logger.info(f"批量导入完成: 成功 {results['success_count']}, 失败 {results['error_count']}, 跳过 {results['skipped_count']}")
+
         return results
     
     def export_rules(self, rule_type: Optional[str] = None, enabled_only: bool = False) -> List[Dict[str, Any]]:
@@ -415,53 +1193,164 @@ class DictionaryService:
         Returns:
             规则数据列表
         """
-        rules_to_export = self.rules
-        
-        # 按类型过滤
-        if rule_type:
-            rules_to_export = [rule for rule in rules_to_export if rule.type == rule_type]
+        return list(self.iter_export_rules(rule_type, enabled_only))
+    
+    def iter_export_rules(self, rule_type: Optional[str] = None, enabled_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        逐条导出字典规则，适合流式输出大量规则
         
-        # 按启用状态过滤
-        if enabled_only:
-            rules_to_export = [rule for rule in rules_to_export if rule.enabled]
+        Args:
+            rule_type: 规则类型过滤，None表示导出所有类型
+            enabled_only: 是否只导出启用的规则
+            
+        Returns:
+            规则数据迭代器
+        """
+        # 按类型过滤时直接使用按类型索引的规则列表
+        rules_to_export = self.get_rules_by_type(rule_type) if rule_type else self.rules
         
-        # 转换为简化格式
-        exported_data = []
         for rule in rules_to_export:
-            exported_data.append({
-                'id': rule.id,
-                'type': rule.type,
-                'pattern': rule.pattern,
-                'replacement': rule.replacement,
-                'enabled': rule.enabled,
-                'created_at': rule.created_at,
-                'updated_at': rule.updated_at
-            })
-        
-        return exported_data
+            # 按启用状态过滤
+            if enabled_only and not rule.enabled:
+                continue
+            
+            # 转换为简化格式
+            yield rule.to_dict()
+    
+    @contextmanager
+    def bulk(self):
+        """
+        批量修改上下文
+        
+        上下文内的 add_rule / update_rule / remove_rule 等修改不会逐条写入
+        文件，退出时统一保存一次；合并正则也只在下次处理文本时重建一次。
+        上下文内持有规则锁，其他线程的修改会等待批量操作结束。
+        
+        用法:
+            with service.bulk():
+                service.add_rule(...)
+                service.disable_rule(...)
+        """
+        with self._lock, self._batched_save():
+            yield self
+    
+    @contextmanager
+    def _batched_save(self):
+        """
+        批量保存上下文
+        
+        上下文内的 _save_rules 调用只做标记，退出时最多写一次文件。
+        支持嵌套，仅最外层退出时保存。
+        """
+        if self._in_batch:
+            yield
+            return
+        
+        self._in_batch = True
+        self._batch_pending = False
+        try:
+            yield
+        finally:
+            self._in_batch = False
+            if self._batch_pending:
+                self._batch_pending = False
+                self._save_rules()
     
     def _save_rules(self) -> None:
-        """保存规则到文件 - 使用简化的结构"""
+        """
+        请求保存规则到文件
+        
+        实际写入由后台线程完成，调用方不再阻塞在磁盘 I/O 上。快照在这里
+        生成，已有待处理的保存请求时用新快照替换旧快照并合并为一次写入。
+        """
+        if self._in_batch:
+            self._batch_pending = True
+            return
+        
+        self._ensure_writer()
+        # 在规则锁内生成并提交快照，并发保存时较新的快照不会被较旧的覆盖
+        with self._lock:
+            self._set_pending(self.snapshot())
         try:
-            # 统计信息
-            enabled_count = len([rule for rule in self.rules if rule.enabled])
-            type_counts = {}
-            for rule in self.rules:
-                type_counts[rule.type] = type_counts.get(rule.type, 0) + 1
-            
-            data = {
-                'version': '2.0',  # 版本标识
-                'rules': [rule.to_dict() for rule in self.rules],
-                'metadata': {
-                    'updated_at': datetime.now().isoformat(),
-                    'total_rules': len(self.rules),
-                    'enabled_rules': enabled_count,
-                    'type_counts': type_counts
-                }
-            }
-            
-            with open(self.rules_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._save_queue.put_nowait(None)
+        except queue.Full:
+            pass
+    
+    def _set_pending(self, snapshot: Dict[str, Any]) -> None:
+        """替换待写入的快照"""
+        with self._pending_lock:
+            self._pending_snapshot = snapshot
+    
+    def _write_pending(self) -> None:
+        """写入最新的待写入快照，已被之前的写入取走时不做任何事"""
+        with self._pending_lock:
+            snapshot, self._pending_snapshot = self._pending_snapshot, None
+        if snapshot is not None:
+            self._write_rules_file(snapshot)
+    
+    def flush(self) -> None:
+        """
+        等待所有待处理的保存请求写入文件
+        
+        在 bulk() 上下文内调用时，上下文内的修改尚未提交保存，
+        会在退出上下文时写入。
+        """
+        if self._writer is not None:
+            self._ensure_writer()
+            self._save_queue.join()
+    
+    def _ensure_writer(self) -> None:
+        """按需启动后台写入线程，fork 后的子进程中线程不存在时重新启动"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                first_start = self._writer is None
+                if not first_start:
+                    # fork 继承的队列和锁中残留父进程写入线程的状态，通知可能被它
+                    # 吞掉；换用新的队列和锁，并补一次保存以免丢失 fork 前未写入的修改
+                    self._save_queue = queue.Queue(maxsize=1)
+                    self._pending_lock = threading.Lock()
+                    self._set_pending(self.snapshot())
+                    self._save_queue.put_nowait(None)
+                self._writer = threading.Thread(
+                    target=_writer_loop,
+                    args=(weakref.ref(self), self._save_queue),
+                    name='dictionary_writer',
+                    daemon=True
+                )
+                self._writer.start()
+                # 服务被回收时唤醒写入线程使其退出；进程退出时不触发，否则会多写一次文件
+                weakref.finalize(self, _wake_writer, self._save_queue).atexit = False
+                if first_start:
+                    # 进程退出前写完最后一次保存
+                    _WRITER_SERVICES.add(self)
+    
+    def _write_rules_file(self, snapshot: Dict[str, Any]) -> None:
+        """
+        将规则快照写入文件 - 使用简化的结构
+        
+        Args:
+            snapshot: snapshot() 返回的规则快照
+        """
+        try:
+            # 先写临时文件再原子替换，避免进程中途退出导致文件损坏；
+            # 每条规则单独序列化为一行逐条写出，不在内存中拼出整个文件
+            tmp_file = f"{self.rules_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(b'{\n  "version": "2.0",\n  "rules": [')
+                separator = b'\n    '
+                for rule_data in snapshot['rules']:
+                    f.write(separator)
+                    f.write(_dumps(rule_data))
+                    separator = b',\n    '
+                f.write(b'\n  ],\n  "metadata": ')
+                f.write(_dumps(snapshot['metadata']))
+                f.write(b'\n}\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.rules_file)
                 
         except Exception as e:
             self.logger.error(f"保存规则文件失败: {e}")
@@ -469,65 +1358,35 @@ class DictionaryService:
     
     def _create_default_rules(self) -> None:
         """创建默认规则 - 使用简化的ID和结构"""
-        default_rules = [
-            {
-                'id': '1',
-                'type': 'pronunciation',
-                'pattern': r'\bGitHub\b',
-                'replacement': '吉特哈布',
-                'enabled': True,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            },
-            {
-                'id': '2',
-                'type': 'pronunciation',
-                'pattern': r'\bAPI\b',
-                'replacement': 'A P I',
-                'enabled': True,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            },
-            {
-                'id': '3',
-                'type': 'pronunciation',
-                'pattern': r'\bJSON\b',
-                'replacement': 'J S O N',
-                'enabled': True,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            },
-            {
-                'id': '4',
-                'type': 'filter',
-                'pattern': r'敏感词汇',
-                'replacement': '***',
-                'enabled': True,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
+        now = datetime.now().isoformat()
+        rules = [
+            DictionaryRule(created_at=now, updated_at=now, **template)
+            for template in _DEFAULT_RULES_TEMPLATE
         ]
         
-        # 简化的配置文件结构
-        data = {
-            'version': '2.0',  # 版本标识
-            'rules': default_rules,
-            'metadata': {
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
-                'total_rules': len(default_rules)
-            }
-        }
-        
-        with open(self.rules_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 直接使用内存中的规则，无需写入后再从磁盘重新加载
+        with self._lock:
+            self.rules = rules
+            self._by_id = {rule.id: rule for rule in rules}
+            self._next_id = self._scan_next_id()
+            self._recount_rules()
+        self._invalidate_cache()
         
-        # 重新加载规则
-        self.reload_rules()
+        self._write_rules_file(self.snapshot())
     
     def _generate_simple_id(self, rule_type: str) -> str:
         """生成简化的规则ID - 使用自增数字"""
-        # 获取所有规则的数字ID
+        with self._lock:
+            # 规则ID被手动修改为更大的数字时可能冲突，此时重新扫描一次
+            if str(self._next_id) in self._by_id:
+                self._next_id = self._scan_next_id()
+            
+            next_id = self._next_id
+            self._next_id += 1
+            return str(next_id)
+    
+    def _scan_next_id(self) -> int:
+        """扫描全部规则，计算下一个可用的数字ID"""
         existing_ids = []
         for rule in self.rules:
             if rule.id.isdigit():
@@ -536,5 +1395,4 @@ class DictionaryService:
                 # 兼容旧格式
                 existing_ids.append(int(rule.id.split('_')[-1]))
         
-        next_id = max(existing_ids, default=0) + 1
-        return str(next_id)
\ No newline at end of file
+        return max(existing_ids, default=0) + 1
\ No newline at end of file
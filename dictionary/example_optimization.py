@@ -16,13 +16,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dictionary.dictionary_service import DictionaryService
 
+# 演示用的临时规则文件优先放在内存文件系统中，避免保存时的磁盘同步开销
+TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
 
 def main():
     """主演示函数"""
     print("=== 字典功能优化演示 ===\n")
     
     # 创建临时文件用于演示
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, dir=TEMP_DIR)
     temp_file.close()
     
     try:
@@ -46,8 +49,8 @@ def main():
         print(f"\n2. 简化的配置文件结构演示")
         print("-" * 30)
         
-        with open(temp_file.name, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        # 直接读取内存快照，结构与规则文件相同
+        config_data = service.snapshot()
         
         print("配置文件结构:")
         print(f"  版本: {config_data.get('version')}")
@@ -134,11 +137,13 @@ def main():
             "请处理这些敏感词和不当内容"
         ]
         
-        for text in test_texts:
-            processed = service.process_text(text)
-            print(f"原文: {text}")
-            print(f"处理后: {processed}")
-            print()
+        # 先收集输出再一次性写出，避免循环内逐行写 stdout
+        lines = []
+        for text, processed in zip(test_texts, service.process_batch(test_texts)):
+            lines.append(f"原文: {text}")
+            lines.append(f"处理后: {processed}")
+            lines.append("")
+        print("\n".join(lines))
         
         # 6. 演示规则管理
         print(f"6. 规则管理演示")
@@ -148,17 +153,12 @@ def main():
         all_rules = service.get_all_rules()
         print(f"当前总规则数: {len(all_rules)}")
         
-        # 按类型统计
-        type_counts = {}
-        enabled_counts = {}
-        for rule in all_rules:
-            type_counts[rule.type] = type_counts.get(rule.type, 0) + 1
-            if rule.enabled:
-                enabled_counts[rule.type] = enabled_counts.get(rule.type, 0) + 1
+        # 按类型统计（服务内部增量维护，无需遍历规则）
+        stats = service.get_stats()
         
         print("规则统计:")
-        for rule_type, count in type_counts.items():
-            enabled_count = enabled_counts.get(rule_type, 0)
+        for rule_type, count in stats['type_counts'].items():
+            enabled_count = stats['enabled_counts'].get(rule_type, 0)
             print(f"  {rule_type}: {count} 条 (启用: {enabled_count})")
         
         # 演示规则操作
@@ -183,7 +183,7 @@ def main():
         print("-" * 30)
         
         # 创建旧格式文件
-        old_format_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        old_format_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, dir=TEMP_DIR)
         old_format_data = {
             'rules': [
                 {
@@ -215,6 +215,7 @@ def main():
         print(f"新添加规则ID: {new_rule_id} (应该是数字格式)")
         
         # 验证文件被升级
+        old_service.flush()
         with open(old_format_file.name, 'r', encoding='utf-8') as f:
             upgraded_data = json.load(f)
         print(f"文件版本已升级到: {upgraded_data.get('version')}")
@@ -230,6 +231,9 @@ def main():
         print("✓ 向后兼容性支持")
         print("✓ 增强的规则管理")
         
+        # 等待后台写入完成，再清理临时文件
+        service.flush()
+        
     finally:
         # 清理临时文件
         if os.path.exists(temp_file.name):
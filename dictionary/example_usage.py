@@ -31,21 +31,25 @@ def main():
     
     print("1. 文本处理示例:")
     print("-" * 50)
-    for i, text in enumerate(test_texts, 1):
-        processed = service.process_text(text)
-        print(f"原文: {text}")
-        print(f"处理后: {processed}")
-        print()
+    # 先收集输出再一次性写出，避免循环内逐行写 stdout
+    lines = []
+    for text, processed in zip(test_texts, service.process_batch(test_texts)):
+        lines.append(f"原文: {text}")
+        lines.append(f"处理后: {processed}")
+        lines.append("")
+    print("\n".join(lines))
     
     print("2. 规则管理示例:")
     print("-" * 50)
     
     # 显示当前规则
     print("当前规则:")
-    for rule in service.get_all_rules():
+    lines = []
+    for rule in service.iter_rules():
         status = "启用" if rule.enabled else "禁用"
-        print(f"  {rule.id}: {rule.type} - {rule.pattern} -> {rule.replacement} ({status})")
-    print()
+        lines.append(f"  {rule.id}: {rule.type} - {rule.pattern} -> {rule.replacement} ({status})")
+    lines.append("")
+    print("\n".join(lines))
     
     # 添加新规则
     print("添加新的发音规则...")
@@ -9,10 +9,46 @@ import os
 import sys
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def setup_docker_config():
-    """设置 Docker 环境配置"""
+try:
+    import orjson
+except ImportError:
+    # orjson 未安装时回退到标准库 json
+    orjson = None
+
+def _hash_password(password):
+    """使用 bcrypt 生成密码哈希"""
+    import bcrypt
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def start_password_hashing():
+    """
+    如果环境变量中有自定义密码，在后台线程中开始计算哈希
+    
+    bcrypt 有意设计得很慢，提前启动可以和目录创建等初始化步骤重叠。
+    
+    Returns:
+        计算哈希的 Future，没有自定义密码时返回 None
+    """
+    custom_password = os.getenv("TTS_ADMIN_PASSWORD")
+    if not custom_password or custom_password == "admin123":
+        return None
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password_hash")
+    future = executor.submit(_hash_password, custom_password)
+    executor.shutdown(wait=False)
+    return future
+
+def setup_docker_config(password_future=None):
+    """
+    设置 Docker 环境配置
+    
+    Args:
+        password_future: start_password_hashing 返回的 Future，为 None 时在此处开始计算
+    """
     config_file = Path("/app/config.json")
     
     # 默认配置
@@ -49,17 +85,19 @@ def setup_docker_config():
         }
     }
     
-    # 如果环境变量中有自定义密码，重新生成哈希
-    custom_password = os.getenv("TTS_ADMIN_PASSWORD")
-    if custom_password and custom_password != "admin123":
-        import bcrypt
-        salt = bcrypt.gensalt()
-        password_hash = bcrypt.hashpw(custom_password.encode('utf-8'), salt)
-        default_config["admin"]["password_hash"] = password_hash.decode('utf-8')
+    # 如果环境变量中有自定义密码，使用重新生成的哈希
+    if password_future is None:
+        password_future = start_password_hashing()
+    if password_future is not None:
+        default_config["admin"]["password_hash"] = password_future.result()
     
-    # 写入配置文件
-    with open(config_file, 'w', encoding='utf-8') as f:
-        json.dump(default_config, f, indent=2, ensure_ascii=False)
+    # 写入配置文件，orjson 直接输出 UTF-8 字节
+    if orjson is not None:
+        with open(config_file, 'wb') as f:
+            f.write(orjson.dumps(default_config, option=orjson.OPT_INDENT_2))
+    else:
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(default_config, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Docker 配置已生成: {config_file}")
     return default_config
@@ -73,14 +111,46 @@ def ensure_directories():
         "/app/dictionary"
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"📁 目录已创建: {directory}")
+    # 只为缺失的目录调用 makedirs，镜像中已存在的目录无需重复创建
+    missing = [directory for directory in directories if not os.path.isdir(directory)]
+    for directory in missing:
+        os.makedirs(directory, exist_ok=True)
+    
+    if missing:
+        print(f"📁 目录已创建: {', '.join(missing)}")
+
+def exec_gunicorn(config):
+    """
+    用 gunicorn 替换当前进程启动应用
+    
+    固定使用单个 worker 进程：字典规则、用户设置等状态保存在进程内存中，
+    多个 worker 各持一份，一个 worker 上的修改其他 worker 看不到，之后的
+    保存还会用过期的副本覆盖文件。并发由 gunicorn_config.py 中的线程数
+    （GUNICORN_THREADS）提供。gunicorn 不可用时返回，由调用方回退到开发服务器。
+    """
+    args = [
+        "gunicorn",
+        "-c", "gunicorn_config.py",
+        "-b", f"{config['system']['host']}:{config['system']['port']}",
+        "-w", "1",
+        "app_enhanced:app"
+    ]
+    
+    # exec 后当前进程的缓冲区不会再被写出
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execvp(args[0], args)
+    except OSError as e:
+        print(f"⚠️  无法启动 gunicorn，回退到开发服务器: {e}")
 
 def main():
     """主函数"""
     print("🐳 Docker 环境初始化...")
     
+    # 尽早开始计算密码哈希，与后续初始化并行
+    password_future = start_password_hashing()
+    
     # 设置工作目录
     os.chdir("/app")
     
@@ -88,7 +158,7 @@ def main():
     ensure_directories()
     
     # 设置配置
-    config = setup_docker_config()
+    config = setup_docker_config(password_future)
     
     # 显示配置信息
     print("\n📋 当前配置:")
@@ -104,9 +174,15 @@ def main():
     print("🔗 API 端点: http://localhost:8080/api")
     print("❤️  健康检查: http://localhost:8080/health")
     
+    # 非调试模式使用 gunicorn 多线程 worker，调试模式使用 Flask 开发服务器
+    if not config['system']['debug']:
+        exec_gunicorn(config)
+    
     # 导入并启动应用
     try:
         from app_enhanced import app
+        from enhanced_tts_api import enhanced_tts_service
+        enhanced_tts_service.start_warm_up()
         app.run(
             host=config['system']['host'],
             port=config['system']['port'],
@@ -4,16 +4,33 @@
 重构现有的 /api 端点，提供更好的错误处理、参数验证和用户体验。
 """
 
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context, has_request_context
 import io
+import os
+import logging
+import re
+import hashlib
 import time
-import uuid
+import secrets
+import queue
 import asyncio
+import subprocess
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable, AsyncIterator, Sequence, FrozenSet, NamedTuple, Union
 from pydub import AudioSegment
 import edge_tts
 
+try:
+    import av
+except ImportError:
+    # PyAV 为可选依赖，未安装时由 pydub 启动 ffmpeg 进程解码
+    av = None
+
 # 导入自定义模块
 from error_handler.error_handler import ErrorHandler, error_handler_middleware
 from error_handler.exceptions import (
@@ -25,6 +42,132 @@ from logger.structured_logger import get_logger, performance_timer
 from config.config_manager import config_manager
 
 
+class Segment(NamedTuple):
+    """文本段：text 为文本，tag 为 narration（旁白）或 dialogue（对话）"""
+    text: str
+    tag: str
+
+
+class CacheEntry(NamedTuple):
+    """音频缓存条目：音频段（流式请求为未解码的 MP3 数据）、加入时间和字节数"""
+    segment: Union[AudioSegment, bytes]
+    timestamp: float
+    size: int
+
+
+# 流式合成时标记一段音频数据结束
+_STREAM_END = object()
+
+# 语音名称格式（简单验证）
+_VOICE_RE = re.compile(r'^[a-zA-Z]{2}-[a-zA-Z]{2}-\w+$')
+
+# 统计信息的复用时间（秒），频繁轮询时不必每次重建
+_STATS_TTL = 0.25
+
+# 无法获取实际语音列表时使用的备用语音
+_FALLBACK_VOICES = (
+    "zh-CN-XiaoxiaoNeural",
+    "zh-CN-YunxiNeural", 
+    "zh-CN-YunjianNeural",
+    "zh-CN-XiaoyiNeural",
+    "zh-CN-YunyangNeural",
+    "en-US-AriaNeural",
+    "en-US-JennyNeural",
+    "en-US-GuyNeural"
+)
+
+# 音频段采样宽度对应的 ffmpeg 原始 PCM 格式
+_PCM_FORMATS = {1: 'u8', 2: 's16le', 3: 's24le', 4: 's32le'}
+
+# 语音选择支持的语言
+_SUPPORTED_LANGUAGES = frozenset(('zh', 'en', 'ja', 'ko'))
+
+# 语言检测只看文本开头，足以判断语言，也限制了缓存键的大小
+_LANGUAGE_DETECT_CHARS = 512
+_LANGUAGE_CACHE_SIZE = 4096
+
+# 按 (语音, 语速, 文本) 记住的单段 MP3 数据条数，重复的段落不再请求 edge-tts
+_SEGMENT_CACHE_SIZE = 256
+
+# 单个请求同时向 edge-tts 合成的段数上限，max_workers 配置得再大也不超过它
+_MAX_CONCURRENT_SEGMENTS = 16
+
+# 相邻同语音段合并后的最大字符数；合并段作为一次合成请求，过长会超出单段超时
+_MAX_MERGED_TEXT = 1000
+
+# 单段合成的超时时间，以及整个请求生成音频段（含重试和降级语音）的总时限，单位秒
+_SEGMENT_TIMEOUT = 30
+_REQUEST_DEADLINE = 60
+
+# 简单语言检测使用的字符类别，按连续片段匹配后累加长度；
+# 逐字符查区间表（bisect）需要 Python 层循环，实测比这里慢约 3 倍
+_LANGUAGE_CHARS = {
+    'zh': re.compile('[\u4e00-\u9fff]+'),
+    'en': re.compile('[A-Za-z]+'),
+    'ja': re.compile('[\u3040-\u309f\u30a0-\u30ff]+'),
+    'ko': re.compile('[\uac00-\ud7af]+')
+}
+
+
+def _join_audio_segments(segments: List[AudioSegment]) -> AudioSegment:
+    """
+    拼接音频段
+    
+    先把采样参数不一致的段统一为各段中的最大值（与 pydub 相加时的规则相同），
+    再一次性拼接原始 PCM 数据，避免逐个相加时反复复制已拼好的部分。
+    
+    Args:
+        segments: 音频段列表（非空）
+        
+    Returns:
+        拼接后的音频段
+    """
+    frame_rate = max(seg.frame_rate for seg in segments)
+    channels = max(seg.channels for seg in segments)
+    sample_width = max(seg.sample_width for seg in segments)
+    
+    normalized = [
+        seg if (seg.frame_rate, seg.channels, seg.sample_width) == (frame_rate, channels, sample_width)
+        else seg.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+        for seg in segments
+    ]
+    return normalized[0]._spawn(b''.join(seg.raw_data for seg in normalized))
+
+
+def _format_rate(speed: float) -> str:
+    """把语速倍数换算为 edge-tts 的 rate 参数，如 1.2 换算为 +20%"""
+    return f"{float(speed) * 100 - 100:+.0f}%"
+
+
+def _cache_key(parts: Iterable[str]) -> str:
+    """由各组成部分计算音频缓存键"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def _decode_mp3(audio_bytes: bytes) -> AudioSegment:
+    """把 edge-tts 返回的 MP3 数据解码为音频段"""
+    if av is None:
+        return AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
+    
+    # 已安装 PyAV 时在进程内解码为 16 位 PCM，省去每段一次的 ffmpeg 进程和临时文件
+    with av.open(io.BytesIO(audio_bytes), format="mp3") as container:
+        stream = container.streams.audio[0]
+        channels = len(stream.layout.channels)
+        resampler = av.AudioResampler(format="s16", layout=stream.layout, rate=stream.rate)
+        pcm = bytearray()
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                pcm.extend(bytes(resampled.planes[0])[:resampled.samples * channels * 2])
+        for resampled in resampler.resample(None):
+            pcm.extend(bytes(resampled.planes[0])[:resampled.samples * channels * 2])
+    
+    return AudioSegment(data=bytes(pcm), sample_width=2, frame_rate=stream.rate, channels=channels)
+
+
 class RequestValidator:
     """请求参数验证器"""
     
@@ -76,29 +219,17 @@ class RequestValidator:
         all_voice = args.get('all')
         
         # 验证语音名称格式（简单验证）
-        valid_voice_pattern = r'^[a-zA-Z]{2}-[a-zA-Z]{2}-\w+$'
-        import re
-        
-        if narr_voice and not re.match(valid_voice_pattern, narr_voice):
-            raise ValidationError(
-                field_name='narr',
-                message='旁白语音名称格式无效',
-                details={'provided_value': narr_voice, 'expected_pattern': valid_voice_pattern}
-            )
-        
-        if dlg_voice and not re.match(valid_voice_pattern, dlg_voice):
-            raise ValidationError(
-                field_name='dlg',
-                message='对话语音名称格式无效',
-                details={'provided_value': dlg_voice, 'expected_pattern': valid_voice_pattern}
-            )
-        
-        if all_voice and not re.match(valid_voice_pattern, all_voice):
-            raise ValidationError(
-                field_name='all',
-                message='统一语音名称格式无效',
-                details={'provided_value': all_voice, 'expected_pattern': valid_voice_pattern}
-            )
+        for field_name, voice, label in (
+            ('narr', narr_voice, '旁白'),
+            ('dlg', dlg_voice, '对话'),
+            ('all', all_voice, '统一')
+        ):
+            if voice and not _VOICE_RE.match(voice):
+                raise ValidationError(
+                    field_name=field_name,
+                    message=f'{label}语音名称格式无效',
+                    details={'provided_value': voice, 'expected_pattern': _VOICE_RE.pattern}
+                )
         
         validated['narr_voice'] = narr_voice
         validated['dlg_voice'] = dlg_voice
@@ -158,6 +289,10 @@ class EnhancedVoiceSelector:
         self._voice_cache = None
         self._cache_timestamp = None
         self._cache_ttl = 300  # 缓存5分钟
+        # 语音名称索引，(语音列表, 语音集合, 小写->语音, [(小写, 语音)])
+        self._voice_index = None
+        # 最近一次的缓存信息，(生成时间, 对应的缓存时间戳, 信息)
+        self._cache_info = None
         
         # 语言检测器
         try:
@@ -167,6 +302,9 @@ class EnhancedVoiceSelector:
             self.logger.warning("langdetect 未安装，将使用简单的语言检测")
             self._detect_language = self._simple_language_detect
         
+        # 同一文本（重试、重复的段落）只检测一次
+        self._detect_cached = lru_cache(maxsize=_LANGUAGE_CACHE_SIZE)(self._detect_language)
+        
         # 语音配置
         self.voice_config = {
             'zh': ['zh-CN-XiaoxiaoNeural', 'zh-CN-YunxiNeural', 'zh-CN-YunjianNeural'],
@@ -195,22 +333,26 @@ class EnhancedVoiceSelector:
                 self.logger.error("没有可用的语音")
                 return None
             
+            voice_set, voice_lower, voice_lower_items = self._get_voice_index(available_voices)
+            
             # 如果指定了语音，先验证是否可用
             if requested_voice:
                 # 精确匹配
-                if requested_voice in available_voices:
+                if requested_voice in voice_set:
                     self.logger.info(f"使用指定语音: {requested_voice}")
                     return requested_voice
                 
+                requested_lower = requested_voice.lower()
+                
                 # 模糊匹配（忽略大小写）
-                for voice in available_voices:
-                    if voice.lower() == requested_voice.lower():
-                        self.logger.info(f"使用指定语音（模糊匹配）: {voice}")
-                        return voice
+                voice = voice_lower.get(requested_lower)
+                if voice is not None:
+                    self.logger.info(f"使用指定语音（模糊匹配）: {voice}")
+                    return voice
                 
                 # 部分匹配
-                for voice in available_voices:
-                    if requested_voice.lower() in voice.lower() or voice.lower() in requested_voice.lower():
+                for lower, voice in voice_lower_items:
+                    if requested_lower in lower or lower in requested_lower:
                         self.logger.info(f"使用指定语音（部分匹配）: {voice}")
                         return voice
                 
@@ -225,7 +367,7 @@ class EnhancedVoiceSelector:
             suitable_voices = self.get_voices_by_language(language)
             
             # 过滤出实际可用的语音
-            available_suitable_voices = [v for v in suitable_voices if v in available_voices]
+            available_suitable_voices = [v for v in suitable_voices if v in voice_set]
             
             if available_suitable_voices:
                 # 从合适的语音中选择最佳的
@@ -241,7 +383,7 @@ class EnhancedVoiceSelector:
             
             # 如果没有找到对应语言的语音，使用默认语音
             default_voice = self.get_default_voice()
-            if default_voice and default_voice in available_voices:
+            if default_voice and default_voice in voice_set:
                 self.logger.info(f"使用默认语音: {default_voice}")
                 return default_voice
             
@@ -267,7 +409,28 @@ class EnhancedVoiceSelector:
                 self.logger.error(f"紧急回退也失败: {fallback_error}")
             return None
     
-    def get_available_voices(self) -> List[str]:
+    def _get_voice_index(self, voices: Sequence[str]) -> Tuple[FrozenSet[str], Dict[str, str], List[Tuple[str, str]]]:
+        """
+        获取语音列表的索引，语音列表更换后重建
+        
+        Args:
+            voices: 可用语音列表
+            
+        Returns:
+            (语音集合, 小写名称到语音的映射, 按原顺序排列的 (小写名称, 语音) 列表)
+        """
+        index = self._voice_index
+        if index is None or index[0] is not voices:
+            lower_items = [(voice.lower(), voice) for voice in voices]
+            lower_map = {}
+            for lower, voice in lower_items:
+                # 忽略大小写后重名时保留靠前的语音，与逐个比较的结果一致
+                lower_map.setdefault(lower, voice)
+            index = (voices, frozenset(voices), lower_map, lower_items)
+            self._voice_index = index
+        return index[1], index[2], index[3]
+    
+    def get_available_voices(self) -> Sequence[str]:
         """
         获取所有可用的语音（带缓存）
         
@@ -275,7 +438,6 @@ class EnhancedVoiceSelector:
             可用语音列表
         """
         try:
-            import time
             current_time = time.time()
             
             # 检查缓存是否有效
@@ -304,10 +466,10 @@ class EnhancedVoiceSelector:
             
             if voices:
                 self.logger.info(f"获取到 {len(voices)} 个可用语音")
-                # 更新缓存
-                self._voice_cache = voices
+                # 更新缓存，元组只读，多线程共享无需加锁
+                self._voice_cache = tuple(voices)
                 self._cache_timestamp = current_time
-                return voices
+                return self._voice_cache
             else:
                 # 如果无法获取实际语音，返回备用列表
                 self.logger.warning("无法获取实际语音列表，使用备用列表")
@@ -338,18 +500,11 @@ class EnhancedVoiceSelector:
         """
         try:
             # 使用langdetect库检测语言
-            detected = self._detect_language(text)
-            
-            # 映射到支持的语言
-            language_mapping = {
-                'zh-cn': 'zh',
-                'zh': 'zh',
-                'en': 'en',
-                'ja': 'ja',
-                'ko': 'ko'
-            }
+            detected = self._detect_cached(text[:_LANGUAGE_DETECT_CHARS])
             
-            return language_mapping.get(detected, 'zh')  # 默认中文
+            # 映射到支持的语言（zh-cn、zh-tw 等取前两位）
+            language = detected[:2]
+            return language if language in _SUPPORTED_LANGUAGES else 'zh'  # 默认中文
             
         except Exception as e:
             self.logger.warning(f"语言检测失败: {e}，使用默认语言")
@@ -365,31 +520,14 @@ class EnhancedVoiceSelector:
         Returns:
             语言代码
         """
-        # 统计中文字符
-        chinese_chars = sum(1 for char in text if '\u4e00' <= char <= '\u9fff')
-        # 统计英文字符
-        english_chars = sum(1 for char in text if char.isalpha() and ord(char) < 128)
-        # 统计日文字符
-        japanese_chars = sum(1 for char in text if '\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff')
-        # 统计韩文字符
-        korean_chars = sum(1 for char in text if '\uac00' <= char <= '\ud7af')
-        
         total_chars = len(text)
         if total_chars == 0:
             return 'zh'
         
-        # 计算比例
-        chinese_ratio = chinese_chars / total_chars
-        english_ratio = english_chars / total_chars
-        japanese_ratio = japanese_chars / total_chars
-        korean_ratio = korean_chars / total_chars
-        
         # 选择比例最高的语言
         ratios = {
-            'zh': chinese_ratio,
-            'en': english_ratio,
-            'ja': japanese_ratio,
-            'ko': korean_ratio
+            lang: sum(map(len, pattern.findall(text))) / total_chars
+            for lang, pattern in _LANGUAGE_CHARS.items()
         }
         
         detected_lang = max(ratios, key=ratios.get)
@@ -434,23 +572,14 @@ class EnhancedVoiceSelector:
         """获取默认语音"""
         return self.voice_config['default']
     
-    def _get_fallback_voices(self) -> List[str]:
+    def _get_fallback_voices(self) -> Sequence[str]:
         """
         获取备用语音列表
         
         Returns:
             备用语音列表
         """
-        return [
-            "zh-CN-XiaoxiaoNeural",
-            "zh-CN-YunxiNeural", 
-            "zh-CN-YunjianNeural",
-            "zh-CN-XiaoyiNeural",
-            "zh-CN-YunyangNeural",
-            "en-US-AriaNeural",
-            "en-US-JennyNeural",
-            "en-US-GuyNeural"
-        ]
+        return _FALLBACK_VOICES
     
     def refresh_voice_cache(self) -> bool:
         """
@@ -484,8 +613,11 @@ class EnhancedVoiceSelector:
         Returns:
             缓存信息字典
         """
-        import time
         current_time = time.time()
+        memo = self._cache_info
+        if (memo is not None and memo[1] == self._cache_timestamp and
+                current_time - memo[0] < _STATS_TTL):
+            return memo[2]
         
         cache_info = {
             'cached_voices_count': len(self._voice_cache) if self._voice_cache else 0,
@@ -498,6 +630,7 @@ class EnhancedVoiceSelector:
                 current_time - self._cache_timestamp < self._cache_ttl
             )
         }
+        self._cache_info = (current_time, self._cache_timestamp, cache_info)
         
         return cache_info
 
@@ -509,7 +642,7 @@ class EnhancedSpeechRule:
         self.logger = get_logger('speech_rule')
         self.voice_selector = EnhancedVoiceSelector()
     
-    def handle_text(self, text: str) -> List[Dict[str, str]]:
+    def handle_text(self, text: str) -> List[Segment]:
         """
         处理文本，分离旁白和对话
         
@@ -519,25 +652,16 @@ class EnhancedSpeechRule:
         Returns:
             处理后的文本段列表
         """
-        with performance_timer(self.logger, 'text_parsing', text_length=len(text)):
-            result = []
-            tmp_str = ""
-            end_tag = "narration"
-
-            for char in text:
-                if char in ['"', '"']:
-                    if tmp_str.strip():
-                        result.append({"text": tmp_str.strip(), "tag": end_tag})
-                    tmp_str = ""
-                    end_tag = "dialogue" if char == '"' else "narration"
-                else:
-                    tmp_str += char
+        result = []
 
-            if tmp_str.strip():
-                result.append({"text": tmp_str.strip(), "tag": end_tag})
+        # 按英文双引号切分：第一个引号之前为旁白，之后的各段均为对话
+        for index, part in enumerate(text.split('"')):
+            part = part.strip()
+            if part:
+                result.append(Segment(part, "dialogue" if index else "narration"))
 
-            self.logger.info(f"文本解析完成，生成 {len(result)} 个语音段")
-            return result
+        self.logger.info(f"文本解析完成，生成 {len(result)} 个语音段")
+        return result
 
 
 class EnhancedAudioCache:
@@ -546,8 +670,16 @@ class EnhancedAudioCache:
     def __init__(self, size_limit: int = None, time_limit: int = None):
         self.size_limit = size_limit or config_manager.tts.cache_size_limit
         self.time_limit = time_limit or config_manager.tts.cache_time_limit
-        self.cache = []
+        # 缓存键 -> 缓存条目，按加入时间排序，过期和淘汰都从头部弹出
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.current_size = 0
+        # 流式请求在工作线程中写入缓存，字典迭代期间不允许修改
+        self._lock = threading.Lock()
+        # 合并结果缓存，新增音频段时失效，最早的音频段过期后重建
+        self._combined_cache: Optional[AudioSegment] = None
+        self._combined_valid_until = 0.0
+        # 最近一次的统计信息，(生成时间, 统计信息)，缓存变化时失效
+        self._stats_cached = None
         self.logger = get_logger('audio_cache')
         
         # 统计信息
@@ -558,55 +690,111 @@ class EnhancedAudioCache:
             'total_requests': 0
         }
     
-    def add(self, audio_segment: AudioSegment) -> None:
-        """添加音频段到缓存"""
-        current_time = time.time()
-        audio_size = len(audio_segment.raw_data)
-        
-        # 移除过期的音频段
-        self._cleanup_expired(current_time)
+    def add(self, key: str, audio_segment: Union[AudioSegment, bytes]) -> None:
+        """
+        添加音频段到缓存，相同的键只保留最新的一份
         
-        # 移除音频段直到有足够的空间
-        while self.current_size + audio_size > self.size_limit and self.cache:
-            self._evict_oldest()
+        Args:
+            key: 缓存键，见 _cache_key
+            audio_segment: 音频段，或流式请求输出的 MP3 数据，后者在取用时才解码
+        """
+        current_time = time.time()
+        if isinstance(audio_segment, bytes):
+            audio_size = len(audio_segment)
+        else:
+            audio_size = len(audio_segment.raw_data)
         
-        # 添加新音频段
-        self.cache.append((audio_segment, current_time))
-        self.current_size += audio_size
+        with self._lock:
+            # 重复请求替换旧条目并移到末尾，保持按加入时间排序
+            previous = self.cache.pop(key, None)
+            if previous is not None:
+                self.current_size -= previous.size
+            
+            # 移除过期的音频段
+            self._cleanup_expired(current_time)
+            
+            # 移除音频段直到有足够的空间
+            while self.current_size + audio_size > self.size_limit and self.cache:
+                self._evict_oldest()
+            
+            # 添加新音频段
+            self.cache[key] = CacheEntry(audio_segment, current_time, audio_size)
+            self.current_size += audio_size
+            self._combined_cache = None
+            self._stats_cached = None
         
         self.logger.debug(f"缓存添加音频段，大小: {audio_size} 字节")
     
+    def get(self, key: str) -> Optional[AudioSegment]:
+        """
+        按缓存键取出未过期的音频段
+        
+        Args:
+            key: 缓存键，见 _cache_key
+            
+        Returns:
+            音频段，未命中或已过期时返回 None
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+        if entry is None or (time.time() - entry.timestamp) > self.time_limit:
+            return None
+        return self._load(entry)
+    
+    def _load(self, entry: CacheEntry) -> Optional[AudioSegment]:
+        """取出条目中的音频段，MP3 数据在这里解码，解码失败时返回 None"""
+        if not isinstance(entry.segment, bytes):
+            return entry.segment
+        try:
+            return _decode_mp3(entry.segment)
+        except Exception as e:
+            self.logger.error("缓存的 MP3 数据解码失败", error=e)
+            return None
+    
     def combine(self) -> Optional[AudioSegment]:
         """组合缓存中的音频段"""
         self.stats['total_requests'] += 1
+        self._stats_cached = None
         
         if not self.cache:
             self.stats['misses'] += 1
             return None
         
         current_time = time.time()
-        valid_segments = [
-            seg for seg, ts in self.cache 
-            if (current_time - ts) <= self.time_limit
-        ]
-        
-        if not valid_segments:
-            self.stats['misses'] += 1
-            return None
+        with self._lock:
+            if self._combined_cache is not None and current_time < self._combined_valid_until:
+                self.stats['hits'] += 1
+                return self._combined_cache
+            
+            valid_entries = [
+                entry for entry in self.cache.values() 
+                if (current_time - entry.timestamp) <= self.time_limit
+            ]
+            
+            if not valid_entries:
+                self.stats['misses'] += 1
+                return None
+            
+            segments = [segment for segment in map(self._load, valid_entries) if segment is not None]
+            if not segments:
+                self.stats['misses'] += 1
+                return None
+            
+            # 按时间排序，第一个有效音频段最先过期
+            self._combined_cache = _join_audio_segments(segments)
+            self._combined_valid_until = valid_entries[0].timestamp + self.time_limit
         
         self.stats['hits'] += 1
-        return sum(valid_segments)
+        return self._combined_cache
     
     def _cleanup_expired(self, current_time: float) -> None:
         """清理过期的音频段"""
-        original_count = len(self.cache)
-        self.cache = [
-            (seg, ts) for seg, ts in self.cache 
-            if (current_time - ts) <= self.time_limit
-        ]
-        self.current_size = sum(len(seg.raw_data) for seg, _ in self.cache)
+        evicted = 0
+        while self.cache and (current_time - next(iter(self.cache.values())).timestamp) > self.time_limit:
+            _, expired = self.cache.popitem(last=False)
+            self.current_size -= expired.size
+            evicted += 1
         
-        evicted = original_count - len(self.cache)
         if evicted > 0:
             self.stats['evictions'] += evicted
             self.logger.debug(f"清理 {evicted} 个过期音频段")
@@ -614,24 +802,31 @@ class EnhancedAudioCache:
     def _evict_oldest(self) -> None:
         """移除最旧的音频段"""
         if self.cache:
-            oldest_segment, _ = self.cache.pop(0)
-            self.current_size -= len(oldest_segment.raw_data)
+            _, oldest = self.cache.popitem(last=False)
+            self.current_size -= oldest.size
             self.stats['evictions'] += 1
     
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
+        current_time = time.time()
+        memo = self._stats_cached
+        if memo is not None and current_time - memo[0] < _STATS_TTL:
+            return memo[1]
+        
         hit_rate = (
             self.stats['hits'] / self.stats['total_requests'] 
             if self.stats['total_requests'] > 0 else 0
         )
         
-        return {
+        stats = {
             'cache_size': len(self.cache),
             'current_size_bytes': self.current_size,
             'size_limit_bytes': self.size_limit,
             'hit_rate': round(hit_rate, 3),
             'stats': self.stats.copy()
         }
+        self._stats_cached = (current_time, stats)
+        return stats
 
 
 class EnhancedTTSService:
@@ -645,11 +840,45 @@ class EnhancedTTSService:
         self.dictionary_service = DictionaryService()
         self.audio_cache = EnhancedAudioCache()
         
-        # 配置线程池
+        # 配置线程池；网络请求都在后台事件循环上，线程池只做解码等 CPU 工作，不超过 CPU 核数
         self.executor = ThreadPoolExecutor(
-            max_workers=config_manager.system.max_workers,
+            max_workers=min(config_manager.system.max_workers, os.cpu_count() or 1),
             thread_name_prefix='tts_worker'
         )
+        
+        # edge-tts 协程统一在一个后台事件循环上运行，首次使用时启动
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        # 单段 MP3 数据，缓存键 -> (MP3 数据, 加入时间)；只在后台事件循环线程中访问，无需加锁
+        self._segment_cache: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        
+        # 预热不在构造时启动：模块导入（包括 gunicorn 预加载的主进程）不应访问网络
+        self._warm_up_started = False
+    
+    def start_warm_up(self) -> None:
+        """
+        在后台线程中预热，重复调用只启动一次
+        
+        应在 fork 之后调用（gunicorn 的 post_fork 钩子，或开发服务器启动前），
+        子进程不会继承只填充了一半的缓存。不经过线程池，fork 前在主进程中
+        启动过的线程池，子进程里会误以为还有空闲线程。
+        """
+        if self._warm_up_started:
+            return
+        self._warm_up_started = True
+        threading.Thread(target=self.warm_up, name='tts_warm_up', daemon=True).start()
+    
+    def warm_up(self) -> None:
+        """预热语音列表和语言检测，避免首个请求承担延迟加载的开销"""
+        try:
+            with performance_timer(self.logger, 'service_warm_up'):
+                voice_selector = self.speech_rule.voice_selector
+                voice_selector.get_available_voices()
+                # langdetect 在第一次检测时才加载语言档案
+                voice_selector.detect_language('你好，world')
+        except Exception as e:
+            self.logger.warning(f"服务预热失败: {e}")
     
     def process_request(self, request_args: Dict[str, Any]) -> Response:
         """
@@ -661,91 +890,101 @@ class EnhancedTTSService:
         Returns:
             Flask Response 对象
         """
-        request_id = str(uuid.uuid4())[:8]
+        request_id = secrets.token_hex(4)
         self.logger.set_request_id(request_id)
         
         start_time = time.time()
         
         try:
             # 记录请求开始
+            # 只记录文本长度和语速等关键参数，完整请求参数留给错误处理的上下文
             self.logger.info(
                 "TTS 请求开始处理",
                 request_id=request_id,
-                request_args=request_args
+                text_len=len(request_args.get('text') or ''),
+                voice_all=request_args.get('all'),
+                speed=request_args.get('speed')
             )
             
+            # 合成前的各阶段都很快，只记下耗时，最后合并为一条日志
+            stage_timings = {}
+            stage_start = time.perf_counter()
+            
+            def mark(stage: str) -> None:
+                nonlocal stage_start
+                now = time.perf_counter()
+                stage_timings[stage] = round((now - stage_start) * 1000, 2)
+                stage_start = now
+            
             # 参数验证
-            with performance_timer(self.logger, 'parameter_validation'):
-                validated_params = self.validator.validate_tts_request(request_args)
+            validated_params = self.validator.validate_tts_request(request_args)
+            mark('parameter_validation')
             
             # 文本预处理（字典服务）
-            with performance_timer(self.logger, 'text_preprocessing'):
-                processed_text = self.dictionary_service.process_text(validated_params['text'])
+            processed_text = self.dictionary_service.process_text(validated_params['text'])
+            mark('text_preprocessing')
+            # 截断文本只为写日志，未启用 INFO 时跳过
+            if self.logger.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
                     "文本预处理完成",
                     original_text=validated_params['text'][:100] + "..." if len(validated_params['text']) > 100 else validated_params['text'],
                     processed_text=processed_text[:100] + "..." if len(processed_text) > 100 else processed_text
                 )
             
-            # 文本分段处理
-            with performance_timer(self.logger, 'text_segmentation'):
-                text_segments = self.speech_rule.handle_text(processed_text)
-            
-            # 音频生成
-            with performance_timer(self.logger, 'audio_generation'):
-                audio_segments = self._generate_audio_segments(text_segments, validated_params)
+            # 文本分段处理（上面的日志不计入分段耗时）
+            stage_start = time.perf_counter()
+            text_segments = self.speech_rule.handle_text(processed_text)
+            mark('text_segmentation')
             
-            if not audio_segments:
+            if not text_segments:
                 raise AudioGenerationError(
                     message="未能生成任何音频段",
-                    details={'text_segments': len(text_segments)}
+                    details={'text_segments': 0}
                 )
             
-            # 音频合成
-            with performance_timer(self.logger, 'audio_combination'):
-                combined_audio = sum(audio_segments)
-                self.audio_cache.add(combined_audio)
+            # 选择各段语音，相邻且语音相同的段合并为一次合成
+            voiced_segments = self._assign_voices(text_segments, validated_params)
+            mark('voice_selection')
             
-            # 导出音频
-            with performance_timer(self.logger, 'audio_export'):
-                output_io = io.BytesIO()
-                combined_audio.export(output_io, format="webm")
-                output_io.seek(0)
+            self.logger.info("TTS 请求各阶段耗时", request_id=request_id, stages=stage_timings)
+            
+            # 客户端明确要求 webm 时才整段合成并转码
+            if self._wants_webm():
+                return self._webm_response(
+                    voiced_segments, validated_params, request_id, start_time
+                )
+            
+            # 音频生成（流式），先取到第一块数据再返回响应，
+            # 这样首段即失败时仍能走统一的错误处理返回错误信息
+            with performance_timer(self.logger, 'audio_first_chunk'):
+                audio_stream = self._stream_segments(
+                    voiced_segments, validated_params, request_id, start_time
+                )
+                first_chunk = next(audio_stream, None)
+            
+            if first_chunk is None:
+                raise AudioGenerationError(
+                    message="未能生成任何音频段",
+                    details={'text_segments': len(text_segments)}
+                )
             
-            # 记录成功
             duration = time.time() - start_time
             self.logger.info(
-                "TTS 请求处理成功",
+                "TTS 首个音频块已就绪，开始流式输出",
                 request_id=request_id,
-                total_duration_ms=round(duration * 1000, 2),
-                audio_segments_count=len(audio_segments),
-                cache_stats=self.audio_cache.get_stats()
+                first_chunk_ms=round(duration * 1000, 2),
+                text_segments_count=len(text_segments)
             )
             
-            # 准备响应头
-            response_headers = {
-                'X-Audio-Duration': str(len(combined_audio)),
-                'X-Request-ID': request_id,
-                'X-Processing-Time': f"{duration:.3f}s",
-                'X-Speed-Used': str(validated_params['speed'])
-            }
-            
-            # 如果语速被调整，添加相关信息
-            if validated_params.get('speed_adjusted', False):
-                response_headers['X-Speed-Adjusted'] = 'true'
-                response_headers['X-Speed-Original'] = str(validated_params.get('original_speed', 'unknown'))
-                
-                self.logger.info(
-                    "语速参数已自动调整",
-                    request_id=request_id,
-                    original_speed=validated_params.get('original_speed'),
-                    adjusted_speed=validated_params['speed']
-                )
+            def generate():
+                yield first_chunk
+                yield from audio_stream
             
+            # 流式输出时总时长未知，不返回 X-Audio-Duration
             return Response(
-                output_io,
-                mimetype='audio/webm',
-                headers=response_headers
+                stream_with_context(generate()),
+                mimetype='audio/mpeg',
+                headers=self._response_headers(validated_params, request_id, duration)
             )
             
         except Exception as e:
@@ -766,65 +1005,666 @@ class EnhancedTTSService:
             
             return self.error_handler.handle_error(e, context)
     
-    def _generate_audio_segments(self, text_segments: List[Dict[str, str]], 
-                               params: Dict[str, Any]) -> List[AudioSegment]:
+    @staticmethod
+    def _wants_webm() -> bool:
+        """客户端的 Accept 头是否更偏好 webm 而不是 MP3"""
+        if not has_request_context():
+            return False
+        return request.accept_mimetypes.best_match(['audio/mpeg', 'audio/webm']) == 'audio/webm'
+    
+    def _response_headers(self, validated_params: Dict[str, Any], request_id: str,
+                          duration: float) -> Dict[str, str]:
         """
-        生成音频段
+        准备响应头
         
         Args:
-            text_segments: 文本段列表
-            params: 验证后的参数
+            validated_params: 验证后的参数
+            request_id: 请求 ID
+            duration: 已用处理时间（秒）
+            
+        Returns:
+            响应头字典
+        """
+        response_headers = {
+            'X-Request-ID': request_id,
+            'X-Processing-Time': f"{duration:.3f}s",
+            'X-Speed-Used': str(validated_params['speed'])
+        }
+        
+        # 如果语速被调整，添加相关信息
+        if validated_params.get('speed_adjusted', False):
+            response_headers['X-Speed-Adjusted'] = 'true'
+            response_headers['X-Speed-Original'] = str(validated_params.get('original_speed', 'unknown'))
+            
+            self.logger.info(
+                "语速参数已自动调整",
+                request_id=request_id,
+                original_speed=validated_params.get('original_speed'),
+                adjusted_speed=validated_params['speed']
+            )
+        
+        return response_headers
+    
+    def _webm_response(self, voiced_segments: List[Tuple[Segment, str]],
+                       validated_params: Dict[str, Any], request_id: str,
+                       start_time: float) -> Response:
+        """
+        逐段合成并边转码边以 webm 流式返回
+        
+        Args:
+            voiced_segments: (文本段, 语音) 列表
+            validated_params: 验证后的参数
+            request_id: 请求 ID
+            start_time: 请求开始时间
             
         Returns:
-            音频段列表
-        """
-        audio_segments = []
-        futures = {}
-        
-        # 提交所有音频生成任务
-        for segment in text_segments:
-            voice_name = self._get_voice_for_segment(segment, params)
-            future = self.executor.submit(
-                self._fetch_audio_with_retry,
-                segment,
-                params['speed'],
-                voice_name
+            Flask Response 对象
+        """
+        # 先取到第一块数据再返回响应，首段即失败时仍能走统一的错误处理
+        with performance_timer(self.logger, 'audio_first_chunk'):
+            webm_stream = self._stream_webm(voiced_segments, validated_params, request_id, start_time)
+            first_chunk = next(webm_stream, None)
+        
+        if first_chunk is None:
+            raise AudioGenerationError(
+                message="未能生成任何音频段",
+                details={'text_segments': len(voiced_segments)}
             )
-            futures[future] = segment
         
-        # 收集结果
-        for future in futures:
-            segment = futures[future]
+        duration = time.time() - start_time
+        
+        def generate():
+            yield first_chunk
+            yield from webm_stream
+        
+        # 流式输出时总时长未知，不返回 X-Audio-Duration
+        return Response(
+            stream_with_context(generate()),
+            mimetype='audio/webm',
+            headers=self._response_headers(validated_params, request_id, duration)
+        )
+    
+    def _stream_webm(self, voiced_segments: List[Tuple[Segment, str]], params: Dict[str, Any],
+                     request_id: str, start_time: float) -> Iterator[bytes]:
+        """
+        按文本顺序把各段 PCM 写入一个常驻的 ffmpeg 进程，边编码边输出 webm
+        
+        Args:
+            voiced_segments: (文本段, 语音) 列表
+            params: 验证后的参数
+            request_id: 请求 ID
+            start_time: 请求开始时间
+            
+        Yields:
+            webm 数据块
+        """
+        cache_key = self._audio_cache_key(voiced_segments, params)
+        cached_audio = self.audio_cache.get(cache_key)
+        if cached_audio is not None:
+            self.logger.info("TTS 请求命中音频缓存", request_id=request_id)
+            yield self.encode_webm(cached_audio)
+            return
+        
+        audio_iter = self._generate_audio_segments(voiced_segments, params)
+        first = next(audio_iter, None)
+        if first is None:
+            return
+        
+        decoded = [first]
+        command = self._webm_command(first)
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            ) if command else None
+        except OSError as e:
+            self.logger.warning(f"无法启动 ffmpeg: {e}，改用整段导出")
+            process = None
+        
+        if process is None:
+            # 无法流式编码时整段合成后一次性导出
+            decoded.extend(audio_iter)
+            combined_audio = _join_audio_segments(decoded)
+            self.audio_cache.add(cache_key, combined_audio)
+            yield self.encode_webm(combined_audio)
+            return
+        
+        def feed() -> None:
+            """按顺序把各段 PCM 写入 ffmpeg，采样参数与第一段保持一致"""
             try:
-                audio_segment = future.result(timeout=30)  # 30秒超时
-                if audio_segment:
-                    audio_segments.append(audio_segment)
-                    self.logger.debug(f"音频段生成成功: {segment['text'][:50]}...")
-                else:
-                    self.logger.warning(f"音频段生成失败: {segment['text'][:50]}...")
+                process.stdin.write(first.raw_data)
+                for audio_segment in audio_iter:
+                    if (audio_segment.frame_rate, audio_segment.channels, audio_segment.sample_width) != \
+                            (first.frame_rate, first.channels, first.sample_width):
+                        audio_segment = audio_segment.set_frame_rate(first.frame_rate) \
+                            .set_channels(first.channels).set_sample_width(first.sample_width)
+                    decoded.append(audio_segment)
+                    process.stdin.write(audio_segment.raw_data)
+            except (BrokenPipeError, ValueError):
+                # 客户端断开后 ffmpeg 已被结束
+                pass
             except Exception as e:
+                self.logger.error("写入 ffmpeg 失败", error=e)
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+        
+        feeder = threading.Thread(target=feed, name='webm_feeder', daemon=True)
+        feeder.start()
+        
+        try:
+            while True:
+                chunk = process.stdout.read1(65536)
+                if not chunk:
+                    break
+                yield chunk
+            
+            process.wait()
+            feeder.join()
+            
+            # 记录成功
+            duration = time.time() - start_time
+            self.logger.info(
+                "TTS 请求处理成功",
+                request_id=request_id,
+                total_duration_ms=round(duration * 1000, 2),
+                audio_segments_count=len(decoded),
+                ffmpeg_returncode=process.returncode
+            )
+            self.audio_cache.add(cache_key, _join_audio_segments(decoded))
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+    
+    @staticmethod
+    def _webm_command(audio_segment: AudioSegment) -> Optional[List[str]]:
+        """构造从标准输入读取 PCM、向标准输出写 webm 的 ffmpeg 命令，不支持的采样宽度返回 None"""
+        sample_format = _PCM_FORMATS.get(audio_segment.sample_width)
+        if not sample_format:
+            return None
+        return [
+            AudioSegment.converter, '-loglevel', 'error',
+            '-f', sample_format,
+            '-ar', str(audio_segment.frame_rate),
+            '-ac', str(audio_segment.channels),
+            '-i', 'pipe:0',
+            '-f', 'webm', 'pipe:1'
+        ]
+    
+    def encode_webm(self, audio_segment: AudioSegment) -> bytes:
+        """
+        把音频段编码为 webm
+        
+        PCM 数据经管道直接交给 ffmpeg，结果从标准输出读回，不经过临时文件；
+        ffmpeg 调用失败时退回 pydub 的 export。
+        
+        Args:
+            audio_segment: 音频段
+            
+        Returns:
+            webm 数据
+        """
+        command = self._webm_command(audio_segment)
+        if command:
+            try:
+                result = subprocess.run(
+                    command,
+                    input=audio_segment.raw_data,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                if result.returncode == 0 and result.stdout:
+                    return result.stdout
+                self.logger.warning(
+                    "ffmpeg 管道编码失败，改用 pydub 导出",
+                    returncode=result.returncode,
+                    stderr=result.stderr.decode('utf-8', 'replace')[-500:]
+                )
+            except OSError as e:
+                self.logger.warning(f"无法启动 ffmpeg: {e}，改用 pydub 导出")
+        
+        output_io = io.BytesIO()
+        audio_segment.export(output_io, format="webm")
+        return output_io.getvalue()
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """按需启动后台事件循环线程，fork 后的子进程中线程不存在时重新创建"""
+        if self._loop_thread is not None and self._loop_thread.is_alive():
+            return self._loop
+        
+        with self._loop_lock:
+            if self._loop_thread is None or not self._loop_thread.is_alive():
+                # fork 继承的事件循环没有运行它的线程，直接换用新的循环
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='tts_event_loop',
+                    daemon=True
+                )
+                self._loop_thread.start()
+        return self._loop
+    
+    def _stream_segments(self, voiced_segments: List[Tuple[Segment, str]],
+                         params: Dict[str, Any], request_id: str,
+                         start_time: float) -> Iterator[bytes]:
+        """
+        按文本顺序流式输出各段的 MP3 数据
+        
+        当前段之后的若干段在后台事件循环上提前合成，当前段的数据一到即输出，
+        首字节延迟只取决于第一段的合成时间。
+        
+        Args:
+            voiced_segments: (文本段, 语音) 列表
+            params: 验证后的参数
+            request_id: 请求 ID
+            start_time: 请求开始时间
+            
+        Yields:
+            MP3 数据块
+        """
+        loop = self._ensure_loop()
+        # 语速参数按请求换算一次，各段共用
+        rate = _format_rate(params['speed'])
+        window = min(config_manager.system.max_workers, _MAX_CONCURRENT_SEGMENTS)
+        pending = {}
+        audio_buffer = bytearray()
+        segments_count = 0
+        # 逐段的调试日志按请求判断一次级别，未启用时不格式化
+        debug_enabled = self.logger.logger.isEnabledFor(logging.DEBUG)
+        
+        def launch(index: int) -> None:
+            segment, voice = voiced_segments[index]
+            chunks = queue.Queue()
+            future = asyncio.run_coroutine_threadsafe(
+                self._pump_audio(segment.text, voice, rate, chunks), loop
+            )
+            pending[index] = (voice, chunks, future)
+        
+        # 整个请求共用一个截止时间，等待数据块、失败段的重试和降级语音都受它限制
+        deadline = time.monotonic() + _REQUEST_DEADLINE
+        
+        # 正在输出的段已从 pending 中取出，单独记录以便提前结束时取消
+        current = None
+        
+        try:
+            for index in range(min(window, len(voiced_segments))):
+                launch(index)
+            
+            for index, (segment, _) in enumerate(voiced_segments):
+                voice, chunks, future = pending.pop(index)
+                current = future
+                if index + window < len(voiced_segments):
+                    launch(index + window)
+                
+                produced = False
+                try:
+                    while True:
+                        # 单个数据块最多等待 _SEGMENT_TIMEOUT 秒，且不超过请求剩余时间
+                        chunk = chunks.get(timeout=_time_left(deadline))
+                        if chunk is _STREAM_END:
+                            break
+                        if isinstance(chunk, Exception):
+                            raise chunk
+                        produced = True
+                        audio_buffer.extend(chunk)
+                        yield chunk
+                except Exception as e:
+                    future.cancel()
+                    if produced:
+                        # 已经输出了部分数据，无法再整段重试
+                        self.logger.error(
+                            f"音频段流式输出中断: {segment.text[:50]}...",
+                            error=e
+                        )
+                        continue
+                    
+                    self.logger.warning(
+                        f"音频段流式生成失败，改用重试: {segment.text[:50]}...",
+                        error=str(e)
+                    )
+                    audio_bytes = self._fetch_mp3_with_retry(segment, rate, voice, deadline)
+                    if not audio_bytes:
+                        continue
+                    produced = True
+                    audio_buffer.extend(audio_bytes)
+                    yield audio_bytes
+                
+                if produced:
+                    segments_count += 1
+                    if debug_enabled:
+                        self.logger.debug(f"音频段生成成功: {segment.text[:50]}...")
+                else:
+                    self.logger.warning(f"音频段生成失败: {segment.text[:50]}...")
+            
+            # 记录成功
+            duration = time.time() - start_time
+            self.logger.info(
+                "TTS 请求处理成功",
+                request_id=request_id,
+                total_duration_ms=round(duration * 1000, 2),
+                audio_segments_count=segments_count,
+                audio_bytes=len(audio_buffer)
+            )
+            
+            # 原样放入缓存，/audio 端点或 webm 请求取用时才解码
+            if audio_buffer:
+                self.audio_cache.add(self._audio_cache_key(voiced_segments, params), bytes(audio_buffer))
+        finally:
+            # 客户端断开或出错时取消正在输出的段和尚未完成的预取
+            if current is not None:
+                current.cancel()
+            for _, _, future in pending.values():
+                future.cancel()
+    
+    async def _pump_audio(self, text: str, voice: str, rate: str,
+                          chunks: queue.Queue) -> None:
+        """在后台事件循环上合成一段音频，把 MP3 数据块依次放入队列"""
+        try:
+            async for data in self._stream_audio(text, voice, rate):
+                chunks.put(data)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_STREAM_END)
+    
+    async def _stream_audio(self, text: str, voice: str,
+                            rate: str) -> AsyncIterator[bytes]:
+        """
+        使用 edge-tts 流式生成音频
+        
+        Args:
+            text: 文本
+            voice: 语音名称
+            rate: edge-tts 语速参数，如 "+20%"
+            
+        Yields:
+            edge-tts 返回的 MP3 数据块，命中单段缓存时一次给出完整数据
+        """
+        key = _cache_key((voice, rate, text))
+        cached = self._segment_cache.get(key)
+        if cached is not None and (time.time() - cached[1]) <= config_manager.tts.cache_time_limit:
+            self._segment_cache.move_to_end(key)
+            yield cached[0]
+            return
+        
+        audio_buffer = bytearray()
+        communicate = edge_tts.Communicate(text, voice, rate=rate)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio_buffer.extend(chunk["data"])
+                yield chunk["data"]
+        
+        # 只记住完整合成的段，中途出错或被取消时不会走到这里
+        if audio_buffer:
+            self._segment_cache[key] = (bytes(audio_buffer), time.time())
+            self._segment_cache.move_to_end(key)
+            while len(self._segment_cache) > _SEGMENT_CACHE_SIZE:
+                self._segment_cache.popitem(last=False)
+    
+    async def _collect_audio(self, text: str, voice: str, rate: str) -> bytes:
+        """合成一段音频并返回完整的 MP3 数据"""
+        return b''.join([data async for data in self._stream_audio(text, voice, rate)])
+    
+    async def _fetch_audio_async(self, segment: Segment, rate: str,
+                                 voice: str) -> AudioSegment:
+        """
+        在后台事件循环上合成一段音频，并在线程池中解码
+        
+        Args:
+            segment: 文本段
+            rate: edge-tts 语速参数，如 "+20%"
+            voice: 语音名称
+            
+        Returns:
+            音频段
+            
+        Raises:
+            AudioGenerationError: 返回空音频数据
+        """
+        audio_bytes = await self._collect_audio(segment.text, voice, rate)
+        if not audio_bytes:
+            raise AudioGenerationError(
+                message="Edge-TTS 返回空音频数据",
+                details={'text': segment.text, 'voice': voice}
+            )
+        
+        # pydub 解码会启动 ffmpeg 进程，放到线程池里避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _decode_mp3, audio_bytes)
+    
+    def _fetch_mp3_with_retry(self, segment: Segment,
+                              rate: str, voice_name: str,
+                              deadline: Optional[float] = None) -> Optional[bytes]:
+        """
+        使用重试机制获取一段完整的 MP3 数据
+        
+        Args:
+            segment: 文本段
+            rate: edge-tts 语速参数，如 "+20%"
+            voice_name: 语音名称
+            deadline: time.monotonic() 表示的截止时间，每次尝试的超时不超过剩余时间，
+                到期后不再重试或尝试降级语音；为 None 时不限制
+            
+        Returns:
+            MP3 数据或None
+        """
+        def fetch_mp3(voice: str = voice_name) -> bytes:
+            return self._fetch_mp3(segment, rate, voice, timeout=_time_left(deadline))
+        
+        try:
+            return self.error_handler.retry_with_backoff(fetch_mp3, deadline=deadline)
+        except Exception as e:
+            # 尝试降级语音
+            try:
+                return self.error_handler.with_fallback_voice(
+                    voice_name,
+                    fetch_mp3,
+                    voice=voice_name
+                )
+            except Exception as fallback_error:
                 self.logger.error(
-                    f"音频段生成异常: {segment['text'][:50]}...",
-                    error=e
+                    f"音频生成完全失败: {segment.text[:50]}...",
+                    error=fallback_error,
+                    original_error=str(e)
+                )
+                return None
+    
+    def _fetch_mp3(self, segment: Segment, rate: str,
+                   voice: str, timeout: float = _SEGMENT_TIMEOUT) -> bytes:
+        """
+        在后台事件循环上生成一段完整的 MP3 数据
+        
+        Args:
+            segment: 文本段
+            rate: edge-tts 语速参数，如 "+20%"
+            voice: 语音名称
+            timeout: 合成超时时间（秒），超时后取消合成
+            
+        Returns:
+            MP3 数据
+            
+        Raises:
+            ServiceUnavailableError: 服务不可用
+            AudioGenerationError: 音频生成失败
+        """
+        text = segment.text
+        future = None
+        
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._collect_audio(text, voice, rate), self._ensure_loop()
+            )
+            audio_bytes = future.result(timeout=timeout)
+        except Exception as e:
+            # 超时后不再让合成在后台继续占用连接
+            if future is not None:
+                future.cancel()
+            if "network" in str(e).lower() or "connection" in str(e).lower():
+                raise ServiceUnavailableError(
+                    service_name="edge-tts",
+                    message=f"Edge-TTS 服务连接失败: {str(e)}",
+                    details={'text': text, 'voice': voice, 'error': str(e)}
                 )
+            raise AudioGenerationError(
+                message=f"音频生成失败: {str(e)}",
+                details={'text': text, 'voice': voice, 'error': str(e)}
+            )
+        
+        if not audio_bytes:
+            raise AudioGenerationError(
+                message="Edge-TTS 返回空音频数据",
+                details={'text': text, 'voice': voice}
+            )
+        return audio_bytes
+    
+    def _generate_audio_segments(self, voiced_segments: List[Tuple[Segment, str]], 
+                               params: Dict[str, Any]) -> Iterator[AudioSegment]:
+        """
+        按文本顺序逐段生成音频，每段就绪即产出
+        
+        Args:
+            voiced_segments: (文本段, 语音) 列表
+            params: 验证后的参数
+            
+        Yields:
+            音频段
+        """
+        loop = self._ensure_loop()
+        # 语速参数按请求换算一次，各段共用
+        rate = _format_rate(params['speed'])
+        window = min(config_manager.system.max_workers, _MAX_CONCURRENT_SEGMENTS)
+        # 逐段的调试日志按请求判断一次级别，未启用时不格式化
+        debug_enabled = self.logger.logger.isEnabledFor(logging.DEBUG)
+        
+        # 各段在后台事件循环上并发合成，解码交给线程池，不再为每段占用一个工作线程；
+        # 同时合成的段数不超过 window，取走一段再启动后面的一段
+        futures = []
+        
+        def launch(index: int) -> None:
+            segment, voice = voiced_segments[index]
+            futures.append(asyncio.run_coroutine_threadsafe(
+                self._fetch_audio_async(segment, rate, voice), loop
+            ))
+        
+        # 整个请求共用一个截止时间，失败段的重试和降级语音同样受它限制
+        deadline = time.monotonic() + _REQUEST_DEADLINE
+        
+        try:
+            for index in range(min(window, len(voiced_segments))):
+                launch(index)
+            
+            for index, (segment, voice) in enumerate(voiced_segments):
+                future = futures[index]
+                if index + window < len(voiced_segments):
+                    launch(index + window)
+                
+                # 后面的段在等待期间继续合成和解码，按顺序取用不会拖慢它们
+                try:
+                    audio_segment = future.result(timeout=max(0, deadline - time.monotonic()))
+                except Exception as e:
+                    future.cancel()
+                    audio_segment = None
+                    if debug_enabled:
+                        self.logger.debug(
+                            f"音频段并发生成失败: {segment.text[:50]}...",
+                            error=str(e)
+                        )
+                
+                try:
+                    if audio_segment is None:
+                        # 并发合成失败的段走原有的重试和降级语音逻辑，超过截止时间后不再尝试
+                        audio_segment = self._fetch_audio_with_retry(segment, rate, voice, deadline)
+                    
+                    if audio_segment:
+                        if debug_enabled:
+                            self.logger.debug(f"音频段生成成功: {segment.text[:50]}...")
+                    else:
+                        self.logger.warning(f"音频段生成失败: {segment.text[:50]}...")
+                except Exception as e:
+                    audio_segment = None
+                    self.logger.error(
+                        f"音频段生成异常: {segment.text[:50]}...",
+                        error=e
+                    )
+                
+                if audio_segment:
+                    yield audio_segment
+        finally:
+            # 提前结束（客户端断开）时取消尚未完成的段
+            for future in futures:
+                future.cancel()
+    
+    @staticmethod
+    def _audio_cache_key(voiced_segments: List[Tuple[Segment, str]], params: Dict[str, Any]) -> str:
+        """由语速和各段的语音、文本计算整个请求的音频缓存键"""
+        def parts() -> Iterator[str]:
+            yield _format_rate(params['speed'])
+            for segment, voice in voiced_segments:
+                yield voice
+                yield segment.text
+        
+        return _cache_key(parts())
+    
+    def _assign_voices(self, text_segments: List[Segment],
+                       params: Dict[str, Any]) -> List[Tuple[Segment, str]]:
+        """
+        为各段选择语音，并把相邻且语音相同的段合并为一段
+        
+        同一语音的连续文本只需建立一次 edge-tts 连接。合并后的文本不超过
+        _MAX_MERGED_TEXT 个字符，单段超时不会因为合并而覆盖整篇长文本；
+        本身超过上限的段保持原样。
+        
+        Args:
+            text_segments: 文本段列表
+            params: 验证后的参数
+            
+        Returns:
+            (文本段, 语音) 列表
+        """
+        voiced = ((segment, self._get_voice_for_segment(segment, params)) for segment in text_segments)
+        merged = []
         
-        return audio_segments
+        def flush(group: List[Segment], voice: str) -> None:
+            segment = group[0]
+            if len(group) > 1:
+                # 换行分隔，保留原来分段处的停顿
+                segment = Segment('\n'.join(item.text for item in group), segment.tag)
+            merged.append((segment, voice))
+        
+        for voice, run in groupby(voiced, key=itemgetter(1)):
+            group = []
+            length = 0
+            for segment, _ in run:
+                if group and length + 1 + len(segment.text) > _MAX_MERGED_TEXT:
+                    flush(group, voice)
+                    group = []
+                    length = 0
+                length += len(segment.text) + (1 if group else 0)
+                group.append(segment)
+            flush(group, voice)
+        return merged
     
-    def _get_voice_for_segment(self, segment: Dict[str, str], 
+    def _get_voice_for_segment(self, segment: Segment, 
                               params: Dict[str, Any]) -> str:
         """获取段落对应的语音（增强版）"""
         # 如果指定了统一语音，直接使用
         if params.get('all_voice'):
             selected_voice = self.speech_rule.voice_selector.select_voice(
                 requested_voice=params['all_voice'],
-                text=segment['text'],
+                text=segment.text,
                 language=params.get('language', 'auto')
             )
             return selected_voice or params['all_voice']
         
         # 根据段落类型选择语音
         requested_voice = (
-            params.get('narr_voice') if segment['tag'] == 'narration' 
+            params.get('narr_voice') if segment.tag == 'narration' 
             else params.get('dlg_voice')
         )
         
@@ -832,7 +1672,7 @@ class EnhancedTTSService:
         if requested_voice:
             selected_voice = self.speech_rule.voice_selector.select_voice(
                 requested_voice=requested_voice,
-                text=segment['text'],
+                text=segment.text,
                 language=params.get('language', 'auto')
             )
             return selected_voice or requested_voice
@@ -840,58 +1680,60 @@ class EnhancedTTSService:
         # 如果没有指定语音，自动选择
         selected_voice = self.speech_rule.voice_selector.select_voice(
             requested_voice=None,
-            text=segment['text'],
+            text=segment.text,
             language=params.get('language', 'auto')
         )
         
         return selected_voice or self.speech_rule.voice_selector.get_default_voice()
     
-    def _fetch_audio_with_retry(self, segment: Dict[str, str], 
-                               speed: float, voice_name: str) -> Optional[AudioSegment]:
+    def _fetch_audio_with_retry(self, segment: Segment, 
+                               rate: str, voice_name: str,
+                               deadline: Optional[float] = None) -> Optional[AudioSegment]:
         """
         使用重试机制获取音频
         
         Args:
             segment: 文本段
-            speed: 语速
+            rate: edge-tts 语速参数，如 "+20%"
             voice_name: 语音名称
+            deadline: time.monotonic() 表示的截止时间，每次尝试的超时不超过剩余时间，
+                到期后不再重试或尝试降级语音；为 None 时不限制
             
         Returns:
             音频段或None
         """
-        def fetch_audio():
-            return self._fetch_audio(segment, speed, voice_name)
+        def fetch_audio(voice: str = voice_name) -> AudioSegment:
+            return self._fetch_audio(segment, rate, voice, timeout=_time_left(deadline))
         
         try:
             # 使用错误处理器的重试机制
-            return self.error_handler.retry_with_backoff(fetch_audio)
+            return self.error_handler.retry_with_backoff(fetch_audio, deadline=deadline)
         except Exception as e:
             # 尝试降级语音
             try:
                 return self.error_handler.with_fallback_voice(
                     voice_name, 
-                    self._fetch_audio,
-                    segment, 
-                    speed, 
+                    fetch_audio,
                     voice=voice_name
                 )
             except Exception as fallback_error:
                 self.logger.error(
-                    f"音频生成完全失败: {segment['text'][:50]}...",
+                    f"音频生成完全失败: {segment.text[:50]}...",
                     error=fallback_error,
                     original_error=str(e)
                 )
                 return None
     
-    def _fetch_audio(self, segment: Dict[str, str], speed: float, 
-                    voice: str) -> AudioSegment:
+    def _fetch_audio(self, segment: Segment, rate: str, 
+                    voice: str, timeout: float = _SEGMENT_TIMEOUT) -> AudioSegment:
         """
         使用 edge-tts 生成音频
         
         Args:
             segment: 文本段
-            speed: 语速
+            rate: edge-tts 语速参数，如 "+20%"
             voice: 语音名称
+            timeout: 合成超时时间（秒）
             
         Returns:
             音频段
@@ -900,49 +1742,39 @@ class EnhancedTTSService:
             ServiceUnavailableError: 服务不可用
             AudioGenerationError: 音频生成失败
         """
-        text = segment['text']
-        rate = f"{float(speed) * 100 - 100:+.0f}%"
+        self.logger.debug(f"开始生成音频: {segment.text[:50]}... (语音: {voice})")
+        
+        # 在共享的后台事件循环上合成，不再为每段新建事件循环
+        audio_bytes = self._fetch_mp3(segment, rate, voice, timeout)
         
         try:
-            self.logger.debug(f"开始生成音频: {text[:50]}... (语音: {voice})")
-            
-            communicate = edge_tts.Communicate(text, voice, rate=rate)
-            audio_bytes = b''
-            
-            # 创建新的事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            async def get_audio():
-                nonlocal audio_bytes
-                async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        audio_bytes += chunk["data"]
-            
-            loop.run_until_complete(get_audio())
-            loop.close()
-            
-            if not audio_bytes:
-                raise AudioGenerationError(
-                    message="Edge-TTS 返回空音频数据",
-                    details={'text': text, 'voice': voice, 'rate': rate}
-                )
-            
-            audio_segment = AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
-            return audio_segment
-            
+            return _decode_mp3(audio_bytes)
         except Exception as e:
-            if "network" in str(e).lower() or "connection" in str(e).lower():
-                raise ServiceUnavailableError(
-                    service_name="edge-tts",
-                    message=f"Edge-TTS 服务连接失败: {str(e)}",
-                    details={'text': text, 'voice': voice, 'error': str(e)}
-                )
-            else:
-                raise AudioGenerationError(
-                    message=f"音频生成失败: {str(e)}",
-                    details={'text': text, 'voice': voice, 'error': str(e)}
-                )
+            raise AudioGenerationError(
+                message=f"音频生成失败: {str(e)}",
+                details={'text': segment.text, 'voice': voice, 'error': str(e)}
+            )
+
+
+def _time_left(deadline: Optional[float]) -> float:
+    """
+    计算单段合成可用的超时时间
+    
+    Args:
+        deadline: time.monotonic() 表示的截止时间，为 None 时不限制
+        
+    Returns:
+        不超过 _SEGMENT_TIMEOUT 的剩余秒数
+        
+    Raises:
+        AudioGenerationError: 已超过截止时间
+    """
+    if deadline is None:
+        return _SEGMENT_TIMEOUT
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise AudioGenerationError(message="音频生成超过请求截止时间")
+    return min(_SEGMENT_TIMEOUT, remaining)
 
 
 # 创建增强版 TTS 服务实例
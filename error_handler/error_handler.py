@@ -7,24 +7,55 @@
 import time
 import random
 import logging
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
 from functools import wraps
-from flask import Response, jsonify, request
+from types import MappingProxyType
+from flask import Response, has_request_context, jsonify, request
 from werkzeug.exceptions import HTTPException, NotFound
 
+try:
+    import orjson
+except ImportError:
+    # orjson 未安装时使用 Flask 的 jsonify
+    orjson = None
+
 from .exceptions import (
     TTSError, ServiceUnavailableError, AudioGenerationError,
     ValidationError, SystemResourceError, ConfigurationError,
     DictionaryError, CacheError, AuthenticationError, AuthorizationError
 )
 
+# 未传入日志记录器时使用的默认记录器，模块加载时获取一次
+_DEFAULT_LOGGER = logging.getLogger(__name__)
+
+
+def _json_response(data: Dict[str, Any], status_code: int) -> Response:
+    """构造 JSON 响应，已安装 orjson 时直接输出 UTF-8 字节，中文不再转义"""
+    if orjson is None:
+        response = jsonify(data)
+        response.status_code = status_code
+        return response
+    # 错误响应不能因为详情里有无法序列化的值而失败，这类值转为字符串
+    return Response(orjson.dumps(data, default=str), status=status_code, mimetype='application/json')
+
+
+# 未提供上下文时共用的空上下文，只读
+_EMPTY_CONTEXT = MappingProxyType({})
+
+
+# RetryConfig 支持的抖动方式
+_JITTER_MODES = ('full', 'equal', 'decorrelated')
+
 
 class RetryConfig:
     """重试配置类"""
     
+    __slots__ = ('max_retries', 'base_delay', 'max_delay', 'backoff_factor', 'jitter', 'jitter_mode')
+    
     def __init__(self, max_retries: int = 3, base_delay: float = 1.0, 
                  max_delay: float = 60.0, backoff_factor: float = 2.0,
-                 jitter: bool = True):
+                 jitter: bool = True, jitter_mode: str = 'full'):
         """初始化重试配置
         
         Args:
@@ -33,12 +64,32 @@ class RetryConfig:
             max_delay: 最大延迟时间（秒）
             backoff_factor: 退避因子
             jitter: 是否添加随机抖动
+            jitter_mode: 抖动方式，full 在 [0, 上限) 内随机，equal 在 [上限/2, 上限) 内随机，
+                decorrelated 在 [base_delay, 上次延迟*3) 内随机且不超过 max_delay
+        
+        Raises:
+            ValueError: 不支持的抖动方式
         """
+        if jitter_mode not in _JITTER_MODES:
+            raise ValueError(f"抖动方式必须是: {_JITTER_MODES}")
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.backoff_factor = backoff_factor
         self.jitter = jitter
+        self.jitter_mode = jitter_mode
+
+
+class _CircuitState:
+    """熔断器状态，按名称登记在 ErrorHandler 上"""
+    
+    __slots__ = ('failure_count', 'last_failure_time', 'is_open', 'lock')
+    
+    def __init__(self):
+        self.failure_count = 0
+        self.last_failure_time = 0.0
+        self.is_open = False
+        self.lock = threading.Lock()
 
 
 class ErrorHandler:
@@ -47,20 +98,50 @@ class ErrorHandler:
     提供错误处理、重试机制、降级策略等功能。
     """
     
+    # 错误码对应的 HTTP 状态码，只读
+    _STATUS_CODES = MappingProxyType({
+        'TTS_001': 503,  # Service Unavailable
+        'TTS_002': 500,  # Internal Server Error
+        'VAL_001': 400,  # Bad Request
+        'SYS_001': 503,  # Service Unavailable
+        'CFG_001': 500,  # Internal Server Error
+        'DIC_001': 500,  # Internal Server Error
+        'CACHE_001': 500,  # Internal Server Error
+        'AUTH_001': 401,  # Unauthorized
+        'AUTH_002': 403,  # Forbidden
+    })
+    
+    # 客户端错误（参数无效、未认证、无权限），堆栈对排查没有帮助，按警告记录
+    _CLIENT_ERROR_CODES = frozenset(('VAL_001', 'AUTH_001', 'AUTH_002'))
+    
+    # 语音对应的降级语音，只读
+    _FALLBACK_VOICES = MappingProxyType({
+        'zh-CN-YunjianNeural': ('zh-CN-XiaoyiNeural', 'zh-CN-YunyangNeural'),
+        'zh-CN-XiaoyiNeural': ('zh-CN-YunjianNeural', 'zh-CN-YunyangNeural'),
+    })
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         """初始化错误处理器
         
         Args:
             logger: 日志记录器实例
         """
-        self.logger = logger or logging.getLogger(__name__)
+        self.logger = logger or _DEFAULT_LOGGER
         self.retry_config = RetryConfig()
         
-        # 降级策略配置
-        self.fallback_voices = {
-            'zh-CN-YunjianNeural': ['zh-CN-XiaoyiNeural', 'zh-CN-YunyangNeural'],
-            'zh-CN-XiaoyiNeural': ['zh-CN-YunjianNeural', 'zh-CN-YunyangNeural'],
+        # 按异常类型分派的处理方法，沿异常类的 MRO 查找第一个匹配项
+        self._handlers = {
+            TTSError: self._handle_tts_error,
+            ValueError: self._handle_validation_error,
+            ConnectionError: self._handle_connection_error,
+            MemoryError: self._handle_system_error,
         }
+        
+        # 降级策略配置，所有实例共用同一份只读映射
+        self.fallback_voices = self._FALLBACK_VOICES
+        
+        # 熔断器状态登记表，同名函数重复装饰时共用同一份状态
+        self._breakers: Dict[Union[str, Tuple[str, str]], _CircuitState] = {}
     
     def handle_error(self, error: Exception, context: Optional[Dict[str, Any]] = None) -> Response:
         """统一错误处理入口
@@ -72,7 +153,7 @@ class ErrorHandler:
         Returns:
             Flask Response 对象
         """
-        context = context or {}
+        context = context if context is not None else _EMPTY_CONTEXT
         
         # 对于 HTTP 异常（如 404），直接返回标准响应
         if isinstance(error, HTTPException):
@@ -82,22 +163,18 @@ class ErrorHandler:
         self._log_error(error, context)
         
         # 根据异常类型处理
-        if isinstance(error, TTSError):
-            return self._handle_tts_error(error, context)
-        elif isinstance(error, ValueError):
-            return self._handle_validation_error(error, context)
-        elif isinstance(error, ConnectionError):
-            return self._handle_connection_error(error, context)
-        elif isinstance(error, MemoryError):
-            return self._handle_system_error(error, context)
-        else:
-            return self._handle_unknown_error(error, context)
+        handlers = self._handlers
+        for cls in type(error).__mro__:
+            handler = handlers.get(cls)
+            if handler is not None:
+                return handler(error, context)
+        return self._handle_unknown_error(error, context)
     
-    def _handle_http_exception(self, error: HTTPException, context: Dict[str, Any]) -> Response:
+    def _handle_http_exception(self, error: HTTPException, context: Mapping[str, Any]) -> Response:
         """处理 HTTP 异常（如 404, 405 等）"""
         # 对于 404 错误，提供友好的 API 响应
         if isinstance(error, NotFound):
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': {
                     'code': 'NOT_FOUND',
@@ -109,10 +186,10 @@ class ErrorHandler:
                 },
                 'timestamp': time.time(),
                 'request_id': context.get('request_id', 'unknown')
-            }), 404
+            }, 404)
         
         # 对于其他 HTTP 异常，返回标准响应
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': {
                 'code': error.__class__.__name__.upper(),
@@ -121,9 +198,9 @@ class ErrorHandler:
             },
             'timestamp': time.time(),
             'request_id': context.get('request_id', 'unknown')
-        }), error.code
+        }, error.code)
 
-    def _handle_tts_error(self, error: TTSError, context: Dict[str, Any]) -> Response:
+    def _handle_tts_error(self, error: TTSError, context: Mapping[str, Any]) -> Response:
         """处理 TTS 相关错误"""
         status_code = self._get_status_code_for_error(error)
         
@@ -134,67 +211,76 @@ class ErrorHandler:
             'request_id': context.get('request_id', 'unknown')
         }
         
-        return jsonify(response_data), status_code
+        return _json_response(response_data, status_code)
     
-    def _handle_validation_error(self, error: Exception, context: Dict[str, Any]) -> Response:
+    def _handle_validation_error(self, error: Exception, context: Mapping[str, Any]) -> Response:
         """处理参数验证错误"""
+        error_message = str(error)
         validation_error = ValidationError(
             field_name='unknown',
-            message=str(error),
-            details={'original_error': str(error)}
+            message=error_message,
+            details={'original_error': error_message}
         )
+        # 包装异常不会被抛出，记下原始异常供 traceback_info 使用
+        validation_error.__cause__ = error
         return self._handle_tts_error(validation_error, context)
     
-    def _handle_connection_error(self, error: Exception, context: Dict[str, Any]) -> Response:
+    def _handle_connection_error(self, error: Exception, context: Mapping[str, Any]) -> Response:
         """处理连接错误"""
+        error_message = str(error)
         service_error = ServiceUnavailableError(
             service_name='edge-tts',
-            message=f"服务连接失败: {str(error)}",
-            details={'original_error': str(error)}
+            message=f"服务连接失败: {error_message}",
+            details={'original_error': error_message}
         )
+        # 包装异常不会被抛出，记下原始异常供 traceback_info 使用
+        service_error.__cause__ = error
         return self._handle_tts_error(service_error, context)
     
-    def _handle_system_error(self, error: Exception, context: Dict[str, Any]) -> Response:
+    def _handle_system_error(self, error: Exception, context: Mapping[str, Any]) -> Response:
         """处理系统资源错误"""
+        error_message = str(error)
         system_error = SystemResourceError(
             resource_type='memory',
-            message=f"系统资源不足: {str(error)}",
-            details={'original_error': str(error)}
+            message=f"系统资源不足: {error_message}",
+            details={'original_error': error_message}
         )
+        # 包装异常不会被抛出，记下原始异常供 traceback_info 使用
+        system_error.__cause__ = error
         return self._handle_tts_error(system_error, context)
     
-    def _handle_unknown_error(self, error: Exception, context: Dict[str, Any]) -> Response:
+    def _handle_unknown_error(self, error: Exception, context: Mapping[str, Any]) -> Response:
         """处理未知错误"""
+        error_message = str(error)
         unknown_error = TTSError(
-            message=f"未知错误: {str(error)}",
+            message=f"未知错误: {error_message}",
             error_code="UNKNOWN_001",
-            details={'original_error': str(error), 'error_type': type(error).__name__}
+            details={'original_error': error_message, 'error_type': type(error).__name__}
         )
+        # 包装异常不会被抛出，记下原始异常供 traceback_info 使用
+        unknown_error.__cause__ = error
         return self._handle_tts_error(unknown_error, context)
     
     def _get_status_code_for_error(self, error: TTSError) -> int:
         """根据错误类型获取 HTTP 状态码"""
-        status_code_map = {
-            'TTS_001': 503,  # Service Unavailable
-            'TTS_002': 500,  # Internal Server Error
-            'VAL_001': 400,  # Bad Request
-            'SYS_001': 503,  # Service Unavailable
-            'CFG_001': 500,  # Internal Server Error
-            'DIC_001': 500,  # Internal Server Error
-            'CACHE_001': 500,  # Internal Server Error
-            'AUTH_001': 401,  # Unauthorized
-            'AUTH_002': 403,  # Forbidden
-        }
-        return status_code_map.get(error.error_code, 500)
+        return self._STATUS_CODES.get(error.error_code, 500)
     
-    def _log_error(self, error: Exception, context: Dict[str, Any]) -> None:
+    def _log_error(self, error: Exception, context: Mapping[str, Any]) -> None:
         """记录错误日志"""
+        client_error = getattr(error, 'error_code', None) in self._CLIENT_ERROR_CODES
+        level = logging.WARNING if client_error else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        error_message = str(error)
+        # 只解析一次 request 代理，请求上下文之外记为 unknown
+        req = request._get_current_object() if has_request_context() else None
         log_data = {
             'error_type': type(error).__name__,
-            'error_message': str(error),
+            'error_message': error_message,
             'context': context,
-            'request_path': getattr(request, 'path', 'unknown') if request else 'unknown',
-            'request_method': getattr(request, 'method', 'unknown') if request else 'unknown',
+            'request_path': req.path if req is not None else 'unknown',
+            'request_method': req.method if req is not None else 'unknown',
         }
         
         if isinstance(error, TTSError):
@@ -203,10 +289,11 @@ class ErrorHandler:
                 'error_details': error.details
             })
         
-        self.logger.error(f"处理错误: {str(error)}", extra=log_data, exc_info=True)
+        self.logger.log(level, f"处理错误: {error_message}", extra=log_data, exc_info=not client_error)
     
     def retry_with_backoff(self, func: Callable, *args, 
                           retry_config: Optional[RetryConfig] = None, 
+                          deadline: Optional[float] = None,
                           **kwargs) -> Any:
         """使用指数退避算法重试函数执行
         
@@ -214,6 +301,8 @@ class ErrorHandler:
             func: 要重试的函数
             *args: 函数位置参数
             retry_config: 重试配置，如果为 None 则使用默认配置
+            deadline: time.monotonic() 表示的截止时间，到期后不再重试，
+                退避等待也不超过剩余时间；为 None 时不限制
             **kwargs: 函数关键字参数
             
         Returns:
@@ -223,38 +312,59 @@ class ErrorHandler:
             最后一次执行的异常
         """
         config = retry_config or self.retry_config
+        # 配置项在循环前取到局部变量，每次尝试不再查属性
+        max_retries = config.max_retries
+        base_delay = config.base_delay
+        max_delay = config.max_delay
+        jitter = config.jitter
+        jitter_mode = config.jitter_mode
+        log = self.logger
+        func_name = getattr(func, '__name__', None) or str(func)
         last_exception = None
+        # 各次重试的延迟上限只与次数有关，循环前一次算好
+        caps = [
+            min(base_delay * (config.backoff_factor ** attempt), max_delay)
+            for attempt in range(max_retries)
+        ]
+        delay = base_delay
         
-        for attempt in range(config.max_retries + 1):
+        for attempt in range(max_retries + 1):
             try:
                 result = func(*args, **kwargs)
-                if attempt > 0:
-                    func_name = getattr(func, '__name__', str(func))
-                    self.logger.info(f"函数 {func_name} 在第 {attempt + 1} 次尝试后成功执行")
+                if attempt > 0 and log.isEnabledFor(logging.INFO):
+                    log.info(f"函数 {func_name} 在第 {attempt + 1} 次尝试后成功执行")
                 return result
                 
             except Exception as e:
                 last_exception = e
                 
-                if attempt == config.max_retries:
-                    func_name = getattr(func, '__name__', str(func))
-                    self.logger.error(f"函数 {func_name} 在 {config.max_retries + 1} 次尝试后仍然失败")
+                if attempt == max_retries:
+                    if log.isEnabledFor(logging.ERROR):
+                        log.error(f"函数 {func_name} 在 {max_retries + 1} 次尝试后仍然失败")
                     break
                 
-                # 计算延迟时间
-                delay = min(
-                    config.base_delay * (config.backoff_factor ** attempt),
-                    config.max_delay
-                )
+                # 计算延迟时间，添加随机抖动让并发的重试错开
+                if not jitter:
+                    delay = caps[attempt]
+                elif jitter_mode == 'decorrelated':
+                    delay = min(max_delay, random.uniform(base_delay, delay * 3))
+                elif jitter_mode == 'equal':
+                    delay = caps[attempt] * (0.5 + random.random() * 0.5)
+                else:
+                    delay = caps[attempt] * random.random()
                 
-                # 添加随机抖动
-                if config.jitter:
-                    delay *= (0.5 + random.random() * 0.5)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        if log.isEnabledFor(logging.ERROR):
+                            log.error(f"函数 {func_name} 第 {attempt + 1} 次执行失败，已超过截止时间，不再重试")
+                        break
+                    delay = min(delay, remaining)
                 
-                func_name = getattr(func, '__name__', str(func))
-                self.logger.warning(
-                    f"函数 {func_name} 第 {attempt + 1} 次执行失败，{delay:.2f}秒后重试: {str(e)}"
-                )
+                if log.isEnabledFor(logging.WARNING):
+                    log.warning(
+                        f"函数 {func_name} 第 {attempt + 1} 次执行失败，{delay:.2f}秒后重试: {str(e)}"
+                    )
                 
                 time.sleep(delay)
         
@@ -272,62 +382,85 @@ class ErrorHandler:
         Returns:
             函数执行结果
         """
+        # 没有配置降级语音时直接调用，异常原样抛出
+        fallback_voices = self.fallback_voices.get(original_voice)
+        if not fallback_voices:
+            return func(*args, **kwargs)
+        
         # 首先尝试原始语音
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            self.logger.warning(f"使用语音 {original_voice} 失败: {str(e)}")
+            log = self.logger
+            warning_enabled = log.isEnabledFor(logging.WARNING)
+            info_enabled = log.isEnabledFor(logging.INFO)
+            if warning_enabled:
+                log.warning(f"使用语音 {original_voice} 失败: {str(e)}")
             
             # 尝试降级语音
-            fallback_voices = self.fallback_voices.get(original_voice, [])
-            
             for fallback_voice in fallback_voices:
                 try:
-                    self.logger.info(f"尝试使用降级语音: {fallback_voice}")
+                    if info_enabled:
+                        log.info(f"尝试使用降级语音: {fallback_voice}")
                     
                     # 更新 kwargs 中的语音参数
                     if 'voice' in kwargs:
                         kwargs['voice'] = fallback_voice
                     
                     result = func(*args, **kwargs)
-                    self.logger.info(f"使用降级语音 {fallback_voice} 成功")
+                    if info_enabled:
+                        log.info(f"使用降级语音 {fallback_voice} 成功")
                     return result
                     
                 except Exception as fallback_error:
-                    self.logger.warning(f"降级语音 {fallback_voice} 也失败: {str(fallback_error)}")
+                    if warning_enabled:
+                        log.warning(f"降级语音 {fallback_voice} 也失败: {str(fallback_error)}")
                     continue
             
             # 所有降级方案都失败，抛出原始异常
             raise e
     
     def circuit_breaker(self, failure_threshold: int = 5, 
-                       recovery_timeout: int = 60) -> Callable:
+                       recovery_timeout: int = 60,
+                       name: Optional[str] = None) -> Callable:
         """熔断器装饰器
         
+        熔断状态按 ``name``（缺省为函数的模块名和 ``__qualname__``）登记，
+        在请求处理函数内部重复装饰同一函数时也共用同一份状态。
+        
         Args:
             failure_threshold: 失败阈值
             recovery_timeout: 恢复超时时间（秒）
+            name: 熔断器名称
             
         Returns:
             装饰器函数
         """
         def decorator(func: Callable) -> Callable:
-            func._failure_count = 0
-            func._last_failure_time = 0
-            func._is_open = False
+            # 状态变化都在锁内完成，多线程下不会丢失失败计数；
+            # dict.setdefault 是原子操作，并发装饰也只会登记一份状态
+            # 不同模块中的同名函数各有一份状态
+            key = name or (func.__module__, func.__qualname__)
+            state = self._breakers.get(key)
+            if state is None:
+                state = self._breakers.setdefault(key, _CircuitState())
             
             @wraps(func)
             def wrapper(*args, **kwargs):
-                current_time = time.time()
-                
-                # 检查熔断器状态
-                if func._is_open:
-                    if current_time - func._last_failure_time > recovery_timeout:
-                        # 尝试恢复
-                        func._is_open = False
-                        func._failure_count = 0
-                        self.logger.info(f"熔断器恢复: {func.__name__}")
-                    else:
+                # 检查熔断器状态，关闭时不加锁
+                if state.is_open:
+                    rejected = False
+                    with state.lock:
+                        if state.is_open:
+                            if time.monotonic() - state.last_failure_time > recovery_timeout:
+                                # 尝试恢复
+                                state.is_open = False
+                                state.failure_count = 0
+                                self.logger.info(f"熔断器恢复: {func.__name__}")
+                            else:
+                                rejected = True
+                    # 异常在锁外构造，熔断期间被拒绝的调用不会排队等锁
+                    if rejected:
                         raise ServiceUnavailableError(
                             service_name=func.__name__,
                             message="服务熔断中，请稍后重试"
@@ -335,19 +468,21 @@ class ErrorHandler:
                 
                 try:
                     result = func(*args, **kwargs)
-                    # 成功执行，重置失败计数
-                    func._failure_count = 0
-                    return result
-                    
-                except Exception as e:
-                    func._failure_count += 1
-                    func._last_failure_time = current_time
-                    
-                    if func._failure_count >= failure_threshold:
-                        func._is_open = True
-                        self.logger.error(f"熔断器开启: {func.__name__}")
-                    
-                    raise e
+                except Exception:
+                    with state.lock:
+                        state.failure_count += 1
+                        state.last_failure_time = time.monotonic()
+                        
+                        if state.failure_count >= failure_threshold and not state.is_open:
+                            state.is_open = True
+                            self.logger.error(f"熔断器开启: {func.__name__}")
+                    raise
+                
+                # 成功执行，重置失败计数；计数已为 0 时不加锁
+                if state.failure_count:
+                    with state.lock:
+                        state.failure_count = 0
+                return result
             
             return wrapper
         return decorator
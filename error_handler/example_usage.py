@@ -97,7 +97,7 @@ def tts_api_with_fallback():
 def tts_api_with_circuit_breaker():
     """带熔断器的 TTS API 端点"""
     
-    @error_handler.circuit_breaker(failure_threshold=3, recovery_timeout=30)
+    @error_handler.circuit_breaker(failure_threshold=3, recovery_timeout=30, name="tts_generation")
     def protected_tts_generation(text: str, voice: str) -> str:
         return simulate_tts_generation(text, voice)
     
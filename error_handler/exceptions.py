@@ -12,8 +12,11 @@ class TTSError(Exception):
     """TTS 系统基础异常类
     
     所有 TTS 相关异常的基类，提供统一的错误信息格式和错误码机制。
+    子类需声明 ``__slots__ = ()``，属性不再占用实例字典。
     """
     
+    __slots__ = ('message', 'error_code', 'details', '_traceback_info')
+    
     def __init__(self, message: str, error_code: str, details: Optional[Dict[str, Any]] = None):
         """初始化 TTS 异常
         
@@ -26,7 +29,29 @@ class TTSError(Exception):
         self.message = message
         self.error_code = error_code
         self.details = details or {}
-        self.traceback_info = traceback.format_exc()
+        # 格式化推迟到真正需要堆栈信息时；不另外保存正在处理的异常，
+        # 以免本异常存活期间一直持有那个异常的堆栈帧
+        self._traceback_info: Optional[str] = None
+    
+    @property
+    def traceback_info(self) -> str:
+        """堆栈信息，首次访问时格式化
+        
+        在处理其他异常时抛出则为那个异常（解释器设置的 __context__）的堆栈，
+        与 traceback.format_exc() 相同；未抛出的包装异常使用 __cause__ 指向的
+        原始异常；否则为本异常抛出处的堆栈。
+        """
+        if self._traceback_info is None:
+            source = self.__context__ or self.__cause__
+            if source is None and self.__traceback__ is not None:
+                source = self
+            if source is None:
+                self._traceback_info = 'NoneType: None\n'
+            else:
+                self._traceback_info = ''.join(
+                    traceback.format_exception(type(source), source, source.__traceback__)
+                )
+        return self._traceback_info
     
     def to_dict(self) -> Dict[str, Any]:
         """将异常转换为字典格式
@@ -52,6 +77,8 @@ class ServiceUnavailableError(TTSError):
     当 Edge-TTS 服务或其他依赖服务不可用时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, service_name: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"服务 {service_name} 当前不可用"
@@ -70,6 +97,8 @@ class AudioGenerationError(TTSError):
     当音频生成过程中发生错误时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "音频生成失败", details: Optional[Dict[str, Any]] = None):
         error_code = "TTS_002"
         super().__init__(message, error_code, details)
@@ -81,6 +110,8 @@ class ValidationError(TTSError):
     当输入参数不符合要求时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, field_name: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"参数 {field_name} 验证失败"
@@ -99,6 +130,8 @@ class SystemResourceError(TTSError):
     当系统资源（内存、磁盘空间等）不足时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, resource_type: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"系统资源不足: {resource_type}"
@@ -117,6 +150,8 @@ class ConfigurationError(TTSError):
     当系统配置有误时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, config_key: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"配置项 {config_key} 错误"
@@ -135,6 +170,8 @@ class DictionaryError(TTSError):
     当字典服务处理过程中发生错误时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "字典服务处理失败", details: Optional[Dict[str, Any]] = None):
         error_code = "DIC_001"
         super().__init__(message, error_code, details)
@@ -146,6 +183,8 @@ class CacheError(TTSError):
     当缓存操作失败时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, operation: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"缓存操作失败: {operation}"
@@ -164,6 +203,8 @@ class AuthenticationError(TTSError):
     当用户认证失败时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "认证失败", details: Optional[Dict[str, Any]] = None):
         error_code = "AUTH_001"
         super().__init__(message, error_code, details)
@@ -175,6 +216,8 @@ class AuthorizationError(TTSError):
     当用户权限不足时抛出。
     """
     
+    __slots__ = ()
+    
     def __init__(self, action: str, message: str = None, details: Optional[Dict[str, Any]] = None):
         if message is None:
             message = f"权限不足，无法执行操作: {action}"
@@ -193,5 +236,7 @@ class SystemError(TTSError):
     当系统级别的错误发生时抛出，如重启失败、服务异常等。
     """
     
+    __slots__ = ()
+    
     def __init__(self, message: str, error_code: str = "SYS_002", details: Optional[Dict[str, Any]] = None):
         super().__init__(message, error_code, details)
\ No newline at end of file
@@ -5,12 +5,16 @@ Gunicorn 配置文件
 """
 
 import os
-import multiprocessing
 
 # 服务器配置
 bind = "0.0.0.0:8080"
-workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
+# 字典规则、用户设置、音频缓存和熔断器状态都保存在进程内存中，多个进程各有一份：
+# 一个进程里的修改其他进程看不到，保存时还会用旧规则覆盖规则文件，
+# /audio 也可能落到没有缓存的进程上。因此默认只启动一个进程，与 docker_start.py 一致；
+# 合成请求主要在等待 edge-tts 的网络响应，并发由线程提供
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
@@ -57,6 +61,12 @@ def pre_fork(server, worker):
 def post_fork(server, worker):
     """工作进程 fork 后的回调"""
     print(f"✅ 工作进程 {worker.pid} 已启动")
+    # 预热放在 fork 之后，每个 worker 各自完整地预热一次
+    try:
+        from enhanced_tts_api import enhanced_tts_service
+    except ImportError:
+        return
+    enhanced_tts_service.start_warm_up()
 
 def pre_exec(server):
     """执行前的回调"""
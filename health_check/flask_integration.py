@@ -12,6 +12,9 @@ import logging
 from .health_monitor import health_monitor
 from .health_controller import health_controller
 
+# 模块级日志记录器，中间件实例共用
+_LOGGER = logging.getLogger(__name__)
+
 
 class HealthCheckMiddleware:
     """健康检查中间件"""
@@ -23,7 +26,7 @@ class HealthCheckMiddleware:
         Args:
             app: Flask应用实例
         """
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOGGER
         if app is not None:
             self.init_app(app)
     
@@ -50,7 +53,7 @@ class HealthCheckMiddleware:
     def _before_request(self):
         """请求开始前的处理"""
         # 记录请求开始时间
-        g.request_start_time = time.time()
+        g.request_start_time = time.monotonic()
         
         # 增加活跃请求计数
         health_monitor.increment_active_requests()
@@ -66,12 +69,12 @@ class HealthCheckMiddleware:
         health_monitor.decrement_active_requests()
         
         # 记录请求处理时间
-        if hasattr(g, 'request_start_time'):
-            duration = time.time() - g.request_start_time
-            
-            # 如果是API请求，记录性能日志
-            if request.path.startswith('/api'):
-                self.logger.info(f"API请求完成: {request.path}, 耗时: {duration:.3f}s")
+        # 仅在 INFO 级别启用时才计算耗时并格式化日志
+        if (hasattr(g, 'request_start_time')
+                and self.logger.isEnabledFor(logging.INFO)
+                and request.path.startswith('/api')):
+            duration = time.monotonic() - g.request_start_time
+            self.logger.info(f"API请求完成: {request.path}, 耗时: {duration:.3f}s")
         
         return response
     
@@ -171,5 +174,5 @@ def setup_health_monitoring(app: Flask, cache_instance=None, app_version: str =
             
             cache_instance.combine = monitored_combine
     
-    logging.getLogger(__name__).info("健康监控已设置完成")
+    _LOGGER.info("健康监控已设置完成")
     return middleware
\ No newline at end of file
@@ -63,6 +63,9 @@ class HealthMonitor:
         self.app_version = app_version
         self.start_time = time.time()
         self._lock = threading.RLock()
+        # 活跃请求计数每个请求都要更新两次，单独用一把普通锁，
+        # 不必等待 record_error 等持有 _lock 的统计操作
+        self._active_lock = threading.Lock()
         
         # 统计数据
         self.active_requests = 0
@@ -82,12 +85,12 @@ class HealthMonitor:
     
     def increment_active_requests(self):
         """增加活跃请求计数"""
-        with self._lock:
+        with self._active_lock:
             self.active_requests += 1
     
     def decrement_active_requests(self):
         """减少活跃请求计数"""
-        with self._lock:
+        with self._active_lock:
             self.active_requests = max(0, self.active_requests - 1)
     
     def record_error(self):
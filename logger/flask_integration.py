@@ -5,7 +5,7 @@ Flask 集成模块
 """
 
 import time
-import uuid
+import secrets
 from flask import Flask, request, g
 from functools import wraps
 from typing import Optional
@@ -48,7 +48,7 @@ class FlaskLoggerIntegration:
         def before_request():
             """请求开始前的处理"""
             # 生成请求ID
-            request_id = str(uuid.uuid4())[:8]
+            request_id = secrets.token_hex(4)
             g.request_id = request_id
             g.start_time = time.time()
             
@@ -13,7 +13,7 @@ from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from pathlib import Path
 import threading
-import uuid
+import secrets
 
 
 class StructuredLogger:
@@ -85,7 +85,7 @@ class StructuredLogger:
     def _get_request_id(self) -> str:
         """获取或生成请求ID"""
         if not hasattr(self._request_local, 'request_id'):
-            self._request_local.request_id = str(uuid.uuid4())[:8]
+            self._request_local.request_id = secrets.token_hex(4)
         return self._request_local.request_id
     
     def set_request_id(self, request_id: str):
@@ -107,23 +107,32 @@ class StructuredLogger:
         
         return record
     
+    # 各级别方法先检查级别，未启用时不构造记录也不做 JSON 序列化
     def debug(self, message: str, **kwargs):
         """记录调试日志"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         record = self._create_log_record('DEBUG', message, **kwargs)
         self.logger.debug(json.dumps(record, ensure_ascii=False))
     
     def info(self, message: str, **kwargs):
         """记录信息日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         record = self._create_log_record('INFO', message, **kwargs)
         self.logger.info(json.dumps(record, ensure_ascii=False))
     
     def warning(self, message: str, **kwargs):
         """记录警告日志"""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         record = self._create_log_record('WARNING', message, **kwargs)
         self.logger.warning(json.dumps(record, ensure_ascii=False))
     
     def error(self, message: str, error: Optional[Exception] = None, **kwargs):
         """记录错误日志"""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         record = self._create_log_record('ERROR', message, **kwargs)
         
         if error:
@@ -135,6 +144,8 @@ class StructuredLogger:
     
     def critical(self, message: str, error: Optional[Exception] = None, **kwargs):
         """记录严重错误日志"""
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
         record = self._create_log_record('CRITICAL', message, **kwargs)
         
         if error:
@@ -146,6 +157,8 @@ class StructuredLogger:
     
     def performance(self, operation: str, duration: float, **kwargs):
         """记录性能监控日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         record = self._create_log_record('INFO', f'Performance: {operation}', **kwargs)
         record['operation'] = operation
         record['duration_ms'] = round(duration * 1000, 2)
@@ -155,6 +168,8 @@ class StructuredLogger:
     
     def audit(self, action: str, user: str, **kwargs):
         """记录审计日志"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         record = self._create_log_record('INFO', f'Audit: {action}', **kwargs)
         record['action'] = action
         record['user'] = user
@@ -221,6 +236,11 @@ class StructuredFormatter(logging.Formatter):
                 else:
                     extra_info.append(f"duration:{duration}ms")
             
+            # 各阶段耗时（毫秒）
+            if isinstance(log_data.get('stages'), dict):
+                for stage, stage_ms in log_data['stages'].items():
+                    extra_info.append(f"{stage}:{stage_ms}ms")
+            
             if 'remote_addr' in log_data and log_data['remote_addr'] != '127.0.0.1':
                 extra_info.append(f"from:{log_data['remote_addr']}")
             
@@ -56,7 +56,7 @@ class RestartMiddleware:
         # 生成请求ID
         request_id = str(uuid.uuid4())
         g.request_id = request_id
-        g.request_start_time = time.time()
+        g.request_start_time = time.monotonic()
         
         # 注册活跃请求
         restart_controller.register_request(
@@ -81,7 +81,7 @@ class RestartMiddleware:
             
             # 记录请求处理时间
             if hasattr(g, 'request_start_time'):
-                duration = time.time() - g.request_start_time
+                duration = time.monotonic() - g.request_start_time
                 response.headers['X-Response-Time'] = f"{duration:.3f}s"
         
         return response
@@ -0,0 +1,138 @@
+"""
+字典服务测试
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from dictionary.dictionary_service import DictionaryService
+
+
+class DictionaryServiceTestCase(unittest.TestCase):
+    """使用临时规则文件的字典服务测试基类"""
+    
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.rules_file = os.path.join(self._tmpdir.name, 'rules.json')
+        with open(self.rules_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': '2.0', 'rules': [], 'metadata': {}}, f)
+        self.service = DictionaryService(self.rules_file)
+    
+    def tearDown(self):
+        self.service.flush()
+        self._tmpdir.cleanup()
+
+
+class TestRuleOrder(DictionaryServiceTestCase):
+    """规则按顺序依次应用"""
+    
+    def test_overlapping_rules_apply_in_order(self):
+        self.service.add_rule('bc', 'X', 'pronunciation')
+        self.service.add_rule('ab', 'Y', 'pronunciation')
+        self.assertEqual(self.service.process_text('abc'), 'aX')
+    
+    def test_chained_rules(self):
+        self.service.add_rule('a', 'b', 'pronunciation')
+        self.service.add_rule('b', 'c', 'pronunciation')
+        self.assertEqual(self.service.process_text('a'), 'c')
+    
+    def test_chained_rules_across_types(self):
+        self.service.add_rule('GitHub', '敏感词', 'pronunciation')
+        self.service.add_rule('敏感词', '***', 'filter')
+        self.assertEqual(self.service.process_text('GitHub'), '***')
+    
+    def test_empty_replacement_joins_later_match(self):
+        self.service.add_rule('-', '', 'pronunciation')
+        self.service.add_rule('ab', 'X', 'pronunciation')
+        self.assertEqual(self.service.process_text('a-b'), 'X')
+    
+    def test_replacement_changes_word_boundary(self):
+        self.service.add_rule('foo', ' ', 'pronunciation')
+        self.service.add_rule(r'\bAPI\b', 'A P I', 'pronunciation')
+        self.assertEqual(self.service.process_text('APIfoo'), 'A P I ')
+    
+    def test_independent_rules_are_fused(self):
+        self.service.add_rule(r'\bAPI\b', 'A P I', 'pronunciation')
+        self.service.add_rule(r'\bJSON\b', 'J S O N', 'pronunciation')
+        self.service.add_rule('敏感词', '***', 'filter')
+        self.assertEqual(
+            self.service.process_text('API 返回 JSON，含敏感词'),
+            'A P I 返回 J S O N，含***'
+        )
+        self.assertIsNotNone(self.service._current_rules().combined_matcher)
+    
+    def test_update_is_visible_after_cached_result(self):
+        rule_id = self.service.add_rule('API', 'A P I', 'pronunciation')
+        self.assertEqual(self.service.process_text('API'), 'A P I')
+        self.service.update_rule(rule_id, replacement='接口')
+        self.assertEqual(self.service.process_text('API'), '接口')
+
+
+
+class TestImportRules(DictionaryServiceTestCase):
+    """批量导入规则"""
+    
+    def test_malformed_entries_are_reported(self):
+        results = self.service.import_rules([
+            None,
+            'pattern',
+            {'pattern': '敏感词'},
+            {'pattern': None, 'replacement': '***', 'type': 'filter'},
+            {'pattern': '敏感词', 'replacement': '***', 'type': 'filter'},
+        ])
+        self.assertEqual(results['success_count'], 1)
+        self.assertEqual(results['error_count'], 4)
+        self.assertTrue(results['errors'][0].startswith('第 1 条规则缺少必需字段'))
+        self.assertTrue(results['errors'][1].startswith('第 2 条规则缺少必需字段'))
+        self.assertTrue(results['errors'][3].startswith('第 4 条规则'))
+        self.assertEqual(self.service.process_text('含敏感词'), '含***')
+
+
+class TestSaveRules(DictionaryServiceTestCase):
+    """后台保存规则文件"""
+    
+    def _run_with_timeout(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive(), '保存等待超时')
+    
+    def test_flush_writes_latest_rules(self):
+        self.service.add_rule('API', 'A P I', 'pronunciation')
+        self.service.add_rule('敏感词', '***', 'filter')
+        self.service.flush()
+        with open(self.rules_file, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual([rule['pattern'] for rule in data['rules']], ['API', '敏感词'])
+    
+    def test_flush_inside_bulk(self):
+        self.service.add_rule('API', 'A P I', 'pronunciation')
+        self.service.flush()
+        
+        def flush_in_bulk():
+            with self.service.bulk():
+                # 模拟进入批量操作前刚提交、尚未写入的保存请求
+                self.service._save_queue.put_nowait(None)
+                self.service.add_rule('JSON', 'J S O N', 'pronunciation')
+                self.service.flush()
+        
+        self._run_with_timeout(flush_in_bulk)
+    
+    def test_reload_inside_bulk(self):
+        self.service.add_rule('API', 'A P I', 'pronunciation')
+        self.service.flush()
+        
+        def reload_in_bulk():
+            with self.service.bulk():
+                self.service._save_queue.put_nowait(None)
+                self.service.reload_rules()
+        
+        self._run_with_timeout(reload_in_bulk)
+        self.assertEqual(self.service.process_text('API'), 'A P I')
+
+
+if __name__ == '__main__':
+    unittest.main()
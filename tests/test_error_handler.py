@@ -0,0 +1,54 @@
+"""
+错误处理器测试
+"""
+
+import json
+import unittest
+
+from flask import Flask
+
+from error_handler.error_handler import ErrorHandler, RetryConfig
+
+
+class TestWrappedTraceback(unittest.TestCase):
+    """包装后的错误响应保留原始异常的堆栈"""
+    
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.handler = ErrorHandler()
+    
+    def _handle(self, error: Exception) -> dict:
+        with self.app.test_request_context('/api'):
+            try:
+                raise error
+            except Exception as e:
+                response = self.handler.handle_error(e)
+        return json.loads(response.get_data())
+    
+    def test_unknown_error_keeps_original_traceback(self):
+        data = self._handle(ZeroDivisionError('division by zero'))
+        self.assertIn('ZeroDivisionError', data['error']['traceback'])
+    
+    def test_validation_error_keeps_original_traceback(self):
+        data = self._handle(ValueError('bad value'))
+        self.assertIn('ValueError: bad value', data['error']['traceback'])
+    
+    def test_connection_error_keeps_original_traceback(self):
+        data = self._handle(ConnectionError('reset'))
+        self.assertIn('ConnectionError: reset', data['error']['traceback'])
+
+
+class TestRetryConfig(unittest.TestCase):
+    """重试配置校验"""
+    
+    def test_known_jitter_modes(self):
+        for mode in ('full', 'equal', 'decorrelated'):
+            self.assertEqual(RetryConfig(jitter_mode=mode).jitter_mode, mode)
+    
+    def test_unknown_jitter_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RetryConfig(jitter_mode='exponential')
+
+
+if __name__ == '__main__':
+    unittest.main()